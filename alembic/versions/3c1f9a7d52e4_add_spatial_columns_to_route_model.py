@@ -0,0 +1,67 @@
+"""add spatial columns to route model
+
+Revision ID: 3c1f9a7d52e4
+Revises: fb3692856c75
+Create Date: 2026-10-19 10:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a7d52e4'
+down_revision: Union[str, Sequence[str], None] = 'fb3692856c75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ('start_lat', 'start_lon', 'end_lat', 'end_lon', 'min_lat', 'min_lon', 'max_lat', 'max_lon'):
+        op.add_column('routes', sa.Column(column, sa.Float(), nullable=True))
+
+    # Backfill from the existing JSONB points
+    op.execute("""
+        UPDATE routes
+        SET start_lat = (start_point->>'lat')::float,
+            start_lon = (start_point->>'lon')::float
+        WHERE start_point ? 'lat' AND start_point ? 'lon'
+    """)
+    op.execute("""
+        UPDATE routes
+        SET end_lat = (end_point->>'lat')::float,
+            end_lon = (end_point->>'lon')::float
+        WHERE end_point ? 'lat' AND end_point ? 'lon'
+    """)
+    op.execute("""
+        UPDATE routes AS r
+        SET min_lat = b.min_lat, min_lon = b.min_lon, max_lat = b.max_lat, max_lon = b.max_lon
+        FROM (
+            SELECT routes.id,
+                   min((p->>'lat')::float) AS min_lat,
+                   min((p->>'lon')::float) AS min_lon,
+                   max((p->>'lat')::float) AS max_lat,
+                   max((p->>'lon')::float) AS max_lon
+            FROM routes, jsonb_array_elements(routes.points_json) AS p
+            WHERE jsonb_typeof(routes.points_json) = 'array'
+              AND p ? 'lat' AND p ? 'lon'
+            GROUP BY routes.id
+        ) AS b
+        WHERE r.id = b.id
+    """)
+
+    op.create_index('ix_routes_start_lat_lon', 'routes', ['start_lat', 'start_lon'], unique=False)
+    op.create_index('ix_routes_end_lat_lon', 'routes', ['end_lat', 'end_lon'], unique=False)
+    op.create_index('ix_routes_bbox', 'routes', ['min_lat', 'max_lat', 'min_lon', 'max_lon'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_routes_bbox', table_name='routes')
+    op.drop_index('ix_routes_end_lat_lon', table_name='routes')
+    op.drop_index('ix_routes_start_lat_lon', table_name='routes')
+    for column in ('max_lon', 'max_lat', 'min_lon', 'min_lat', 'end_lon', 'end_lat', 'start_lon', 'start_lat'):
+        op.drop_column('routes', column)
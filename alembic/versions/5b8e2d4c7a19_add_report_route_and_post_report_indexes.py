@@ -0,0 +1,30 @@
+"""add report route and post report indexes
+
+Revision ID: 5b8e2d4c7a19
+Revises: 3c1f9a7d52e4
+Create Date: 2026-10-19 11:02:17.558204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2d4c7a19'
+down_revision: Union[str, Sequence[str], None] = '3c1f9a7d52e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_reports_route_id'), 'reports', ['route_id'], unique=False)
+    op.create_index(op.f('ix_posts_report_id'), 'posts', ['report_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_posts_report_id'), table_name='posts')
+    op.drop_index(op.f('ix_reports_route_id'), table_name='reports')
@@ -0,0 +1,58 @@
+"""add comment_count to post and reply_count to comment
+
+Revision ID: 9e4a6c1b3f80
+Revises: 5b8e2d4c7a19
+Create Date: 2026-10-19 11:40:05.917346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a6c1b3f80'
+down_revision: Union[str, Sequence[str], None] = '5b8e2d4c7a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('comments', sa.Column('reply_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index(op.f('ix_comments_post_id'), 'comments', ['post_id'], unique=False)
+    op.create_index(op.f('ix_comments_parent_id'), 'comments', ['parent_id'], unique=False)
+
+    # Backfill from the existing comments
+    op.execute("""
+        UPDATE posts
+        SET comment_count = c.cnt
+        FROM (
+            SELECT post_id, count(*) AS cnt
+            FROM comments
+            WHERE parent_id IS NULL AND post_id IS NOT NULL
+            GROUP BY post_id
+        ) AS c
+        WHERE posts.id = c.post_id
+    """)
+    op.execute("""
+        UPDATE comments
+        SET reply_count = c.cnt
+        FROM (
+            SELECT parent_id, count(*) AS cnt
+            FROM comments
+            WHERE parent_id IS NOT NULL
+            GROUP BY parent_id
+        ) AS c
+        WHERE comments.id = c.parent_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_comments_parent_id'), table_name='comments')
+    op.drop_index(op.f('ix_comments_post_id'), table_name='comments')
+    op.drop_column('comments', 'reply_count')
+    op.drop_column('posts', 'comment_count')
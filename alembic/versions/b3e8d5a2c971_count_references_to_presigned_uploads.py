@@ -0,0 +1,45 @@
+"""count references to presigned uploads
+
+Revision ID: b3e8d5a2c971
+Revises: f5c8a3d1b926
+Create Date: 2026-10-20 10:12:37.415209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d5a2c971'
+down_revision: Union[str, Sequence[str], None] = 'f5c8a3d1b926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keys issued by POST /storage/presign: {board|profile}/{user_id}/{uuid4}.{ext}
+PRESIGNED_URL_PATTERN = r'/(board|profile)/[0-9]+/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.[a-z]+$'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Presigned uploads attached before this revision have no stored_objects row,
+    # so releasing one reference would delete the file out from under the others.
+    op.execute(sa.text("""
+        INSERT INTO stored_objects (url, ref_count)
+        SELECT url, count(*)
+        FROM (
+            SELECT url FROM images
+            UNION ALL SELECT map_image_url FROM posts
+            UNION ALL SELECT profile_pic FROM users
+        ) AS refs
+        WHERE url ~ :pattern
+        GROUP BY url
+        ON CONFLICT (url) DO UPDATE SET ref_count = EXCLUDED.ref_count
+    """).bindparams(pattern=PRESIGNED_URL_PATTERN))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The counted rows are harmless to older code, which only reads them for content-addressed files.
+    pass
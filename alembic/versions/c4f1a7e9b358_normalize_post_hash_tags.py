@@ -0,0 +1,56 @@
+"""normalize post hash tags
+
+Revision ID: c4f1a7e9b358
+Revises: b3e8d5a2c971
+Create Date: 2026-10-20 10:48:05.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f1a7e9b358'
+down_revision: Union[str, Sequence[str], None] = 'b3e8d5a2c971'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same rule as services.tag_trends.normalize_tags: trim, drop leading '#',
+    # skip blanks, keep the first occurrence of each tag.
+    op.execute("""
+        WITH normalized AS (
+            SELECT p.id, ARRAY(
+                SELECT d.tag
+                FROM (
+                    SELECT ltrim(btrim(u.tag, E' \\t\\n\\r\\f\\v'), '#') AS tag, min(u.ord) AS first_ord
+                    FROM unnest(p.hash_tag) WITH ORDINALITY AS u(tag, ord)
+                    GROUP BY 1
+                ) AS d
+                WHERE d.tag <> ''
+                ORDER BY d.first_ord
+            )::varchar(10)[] AS tags
+            FROM posts AS p
+            WHERE p.hash_tag IS NOT NULL
+        )
+        UPDATE posts
+        SET hash_tag = normalized.tags
+        FROM normalized
+        WHERE posts.id = normalized.id AND posts.hash_tag IS DISTINCT FROM normalized.tags
+    """)
+    # Removals of tags without a row used to insert negative rows.
+    op.execute("""
+        UPDATE tag_trends
+        SET score = greatest(score, 0), post_count = greatest(post_count, 0)
+        WHERE score < 0 OR post_count < 0
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original spellings are not kept; normalized tags work with older code too.
+    pass
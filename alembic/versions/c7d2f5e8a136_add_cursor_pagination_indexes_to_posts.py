@@ -0,0 +1,33 @@
+"""add cursor pagination indexes to posts
+
+Revision ID: c7d2f5e8a136
+Revises: 9e4a6c1b3f80
+Create Date: 2026-10-19 13:25:48.330172
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2f5e8a136'
+down_revision: Union[str, Sequence[str], None] = '9e4a6c1b3f80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_posts_public_created_at_id', 'posts',
+                    [sa.text('created_at DESC'), sa.text('id DESC')],
+                    unique=False, postgresql_where=sa.text('public = true'))
+    op.create_index('ix_posts_user_id_created_at_id', 'posts',
+                    ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_user_id_created_at_id', table_name='posts')
+    op.drop_index('ix_posts_public_created_at_id', table_name='posts')
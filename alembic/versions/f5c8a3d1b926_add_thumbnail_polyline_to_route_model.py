@@ -0,0 +1,118 @@
+"""add thumbnail polyline to route model
+
+Revision ID: f5c8a3d1b926
+Revises: a9d4e7b2c815
+Create Date: 2026-10-19 22:48:31.660297
+
+"""
+import json
+import math
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c8a3d1b926'
+down_revision: Union[str, Sequence[str], None] = 'a9d4e7b2c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 200
+
+# Frozen copy of utill.geo.simplify_polyline as of this revision, so later
+# changes to the simplifier do not alter what this migration writes.
+THUMBNAIL_MAX_POINTS = 32
+THUMBNAIL_PRECISION = 5
+THUMBNAIL_INPUT_MAX_POINTS = 2000
+
+
+def _segment_distance(point, start, end):
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return math.hypot(x - x1, y - y1)
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+def _douglas_peucker(coords, tolerance):
+    keep = {0, len(coords) - 1}
+    stack = [(0, len(coords) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _segment_distance(coords[i], coords[first], coords[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep.add(index)
+            stack.append((first, index))
+            stack.append((index, last))
+    return sorted(keep)
+
+
+def _simplify_polyline(points_json, max_points=THUMBNAIL_MAX_POINTS):
+    coords = [
+        (float(point['lat']), float(point['lon']))
+        for point in points_json or []
+        if point and point.get('lat') is not None and point.get('lon') is not None
+    ]
+    if not coords:
+        return None
+
+    if len(coords) > THUMBNAIL_INPUT_MAX_POINTS:
+        step = len(coords) / (THUMBNAIL_INPUT_MAX_POINTS - 1)
+        coords = [coords[int(i * step)] for i in range(THUMBNAIL_INPUT_MAX_POINTS - 1)] + [coords[-1]]
+
+    if len(coords) > max_points:
+        lats, lons = [lat for lat, _ in coords], [lon for _, lon in coords]
+        tolerance = max(math.hypot(max(lats) - min(lats), max(lons) - min(lons)) * 0.005, 1e-7)
+        kept = _douglas_peucker(coords, tolerance)
+        while len(kept) > max_points:
+            tolerance *= 2
+            coarser = [kept[i] for i in _douglas_peucker([coords[i] for i in kept], tolerance)]
+            if len(coarser) < max_points // 2:
+                step = (len(kept) - 1) / (max_points - 1)
+                coarser = [kept[round(i * step)] for i in range(max_points)]
+            kept = coarser
+        coords = [coords[i] for i in kept]
+
+    return [[round(lat, THUMBNAIL_PRECISION), round(lon, THUMBNAIL_PRECISION)] for lat, lon in coords]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('routes', sa.Column('thumbnail_polyline', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    # ### end Alembic commands ###
+
+    # 단순화는 파이썬에서 하므로 배치로 채운다
+    conn = op.get_bind()
+    update = sa.text("UPDATE routes SET thumbnail_polyline = CAST(:thumbnail AS jsonb) WHERE id = :id")
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, points_json FROM routes WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        updates = [
+            {"id": row.id, "thumbnail": json.dumps(thumbnail)}
+            for row in rows
+            if (thumbnail := _simplify_polyline(row.points_json)) is not None
+        ]
+        if updates:
+            conn.execute(update, updates)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_column('routes', 'thumbnail_polyline')
+    # ### end Alembic commands ###
@@ -0,0 +1,51 @@
+"""
+Reconciles the denormalized comment counters with the comments table.
+
+Counters are maintained atomically by the comment service, so this job only
+repairs drift (manual SQL, failed deploys, cascaded deletes). Run it from
+cron or by hand:
+
+    python -m jobs.reconcile_counters
+"""
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, aliased
+
+from database import SessionLocal
+from models import Post, Comment
+
+
+def reconcile_comment_counts(db: Session) -> dict:
+    """Rewrite Post.comment_count and Comment.reply_count where they drifted. Returns fixed row counts."""
+    actual_comments = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id, Comment.parent_id.is_(None))
+        .scalar_subquery()
+    )
+    posts_fixed = (
+        db.query(Post)
+        .filter(Post.comment_count != actual_comments)
+        .update({Post.comment_count: actual_comments}, synchronize_session=False)
+    )
+
+    Reply = aliased(Comment)
+    actual_replies = (
+        select(func.count(Reply.id))
+        .where(Reply.parent_id == Comment.id)
+        .scalar_subquery()
+    )
+    comments_fixed = (
+        db.query(Comment)
+        .filter(Comment.reply_count != actual_replies)
+        .update({Comment.reply_count: actual_replies}, synchronize_session=False)
+    )
+
+    db.commit()
+    return {"posts": posts_fixed, "comments": comments_fixed}
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        print(f"Reconciled comment counters: {reconcile_comment_counts(db)}")
+    finally:
+        db.close()
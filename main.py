@@ -1,13 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials # Add HTTPBearer
 from database import init_db # Changed import
 from routers import (
-    community, report, live_record, route, oauth, navigation, user, notice, calender, subscription, purchase
+    community, report, live_record, route, oauth, navigation, user, notice, calender, subscription, purchase, upload, notification
 )
 from models import User, Post, Comment, Report, Route
-from starlette.staticfiles import StaticFiles # Add this import
+from storage.local import UploadStaticFiles, UPLOAD_DIR
 from utils import events
+from services.read_counter import read_count_buffer
+from services.like_counter import like_folder
+from services.hot_posts import hot_pruner
+from services.storage_cleanup import storage_cleanup_worker
+from services.push import push_dispatcher
+from services.notification_stream import notification_bus
 
 from schemas import community as community_schema
 from schemas import report as report_schema
@@ -22,6 +30,27 @@ route_schema.RouteWithReportsResponse.model_rebuild()
 # =========================
 init_db() # Call the function
 
+# =========================
+# 백그라운드 작업 (워커 시작/종료)
+# =========================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    read_count_buffer.start()
+    like_folder.start()
+    hot_pruner.start()
+    storage_cleanup_worker.start()
+    push_dispatcher.start()
+    notification_bus.start()
+    try:
+        yield
+    finally:
+        notification_bus.stop()
+        push_dispatcher.stop() # 대기 중인 푸시 알림을 종료 전에 발송
+        storage_cleanup_worker.stop()
+        hot_pruner.stop()
+        like_folder.stop()
+        read_count_buffer.stop() # 버퍼에 남은 조회수를 종료 전에 기록
+
 # =========================
 # FastAPI 앱 생성
 # =========================
@@ -29,6 +58,7 @@ app = FastAPI(
     title="Pedal App MVP",
     description="MVP of Pedal App",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Define the HTTPBearer scheme
@@ -43,12 +73,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # =========================
 # Static Files Serving
 # =========================
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads") # Add this
+app.mount("/uploads", UploadStaticFiles(directory=UPLOAD_DIR), name="uploads") # ETag/immutable 캐시 헤더, Range 지원
 
 # =========================
 # 라우터 등록
@@ -65,6 +96,8 @@ app.include_router(notice.router, dependencies=[Depends(oauth2_scheme)])
 app.include_router(calender.router, dependencies=[Depends(oauth2_scheme)])
 app.include_router(subscription.router)
 app.include_router(purchase.router, dependencies=[Depends(oauth2_scheme)])
+app.include_router(notification.router, dependencies=[Depends(oauth2_scheme)])
+app.include_router(upload.router) # 업로드 URL은 서명된 토큰으로 인증하므로 외부 의존성 없음
 
 # =========================
 # 루트 엔드포인트
@@ -1,8 +1,10 @@
 from .user import User
-from .community import Post, Comment
+from .community import Post, Comment, PostLikeEvent, TagTrend, PostHotScore
 from .report import Report
 from .route import Route
 from .image import Image
 from .notification import Notification, Mention
+from .storage_cleanup import StorageCleanup
+from .stored_object import StoredObject
 
-__all__ = ["User", "Post", "Comment", "Report", "Route", "Image", "Notification", "Mention"]
\ No newline at end of file
+__all__ = ["User", "Post", "Comment", "Report", "Route", "Image", "Notification", "Mention", "PostLikeEvent", "StorageCleanup", "StoredObject", "TagTrend", "PostHotScore"]
\ No newline at end of file
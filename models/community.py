@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, Boolean, String, Text, ForeignKey, DateTime, func, Float, ARRAY, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, Boolean, String, Text, ForeignKey, DateTime, func, Float, ARRAY, Table, Index, LargeBinary, BigInteger, SmallInteger
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from database import Base
 import enum
 from .image import Image
@@ -38,8 +39,11 @@ class Post(Base):
     content = Column(Text, nullable=False)
     like_count = Column(Integer, default=0)
     read_count = Column(Integer, default=0)
+    unique_viewer_count = Column(Integer, default=0, server_default="0", nullable=False)
+    viewer_sketch = deferred(Column(LargeBinary, nullable=True))  # 고유 조회자 추정용 HyperLogLog 레지스터
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)  # 최상위 댓글 수
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    report_id = Column(Integer, ForeignKey("reports.id"), nullable=True)
+    report_id = Column(Integer, ForeignKey("reports.id"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     hash_tag = Column(ARRAY(String(10)), nullable=True)
@@ -49,6 +53,16 @@ class Post(Base):
     distance = Column(Float)
     time = Column(DateTime(timezone=True))
     map_image_url = Column(String, nullable=True)
+    search_vector = deferred(Column(TSVECTOR, nullable=True))  # 제목(A)/본문(B) 바이그램, utils/events.py 에서 갱신
+
+    __table_args__ = (
+        # 공개 피드 / 내 글 목록의 (created_at, id) 커서 페이지네이션용
+        Index("ix_posts_public_created_at_id", created_at.desc(), id.desc(), postgresql_where=(public == True)),
+        Index("ix_posts_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+        # GET /post?tag= 해시태그 검색 (hash_tag @> ARRAY[...])
+        Index("ix_posts_hash_tag", hash_tag, postgresql_using="gin"),
+        Index("ix_posts_search_vector", search_vector, postgresql_using="gin"),
+    )
 
     author = relationship("User", back_populates="posts")
     report = relationship("Report", back_populates="posts")
@@ -77,14 +91,15 @@ class Comment(Base):
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     content = Column(Text, nullable=False)
     like_count = Column(Integer, default=0)
+    reply_count = Column(Integer, default=0, server_default="0", nullable=False)  # 직속 답글 수
     user_id = Column(Integer, ForeignKey("users.id"))
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=True)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=True, index=True)
     report_id = Column(Integer, ForeignKey("reports.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Self-referential relationship for nested comments
-    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True, index=True)
     parent = relationship("Comment", remote_side=[id], back_populates="children")
     children = relationship("Comment", back_populates="parent", cascade="all, delete-orphan")
     mentions = relationship("Mention", back_populates="comment", cascade="all, delete-orphan")
@@ -97,4 +112,43 @@ class Comment(Base):
         secondary=comment_likes,
         back_populates="liked_comments"
     )
-    notifications = relationship("Notification", back_populates="comment", cascade="all, delete-orphan")
\ No newline at end of file
+    notifications = relationship("Notification", back_populates="comment", cascade="all, delete-orphan")
+
+class PostLikeEvent(Base):
+    """Append-only like/unlike deltas, periodically folded into Post.like_count."""
+    __tablename__ = "post_like_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
+    delta = Column(SmallInteger, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TagTrend(Base):
+    """Time-decayed hashtag popularity, updated incrementally as public posts are written.
+
+    score holds the decayed value as of updated_at; readers decay it further to now.
+    """
+    __tablename__ = "tag_trends"
+
+    tag = Column(String(10), primary_key=True)
+    score = Column(Float, nullable=False, default=0, server_default="0")
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class PostHotScore(Base):
+    """Decayed engagement score of a post, updated incrementally from post/like/comment events.
+
+    hot_rank is log2 of the score measured against a fixed epoch (see services/hot_posts.py),
+    so ordering by it equals ordering by the current decayed score and a plain index serves the ranking.
+    """
+    __tablename__ = "post_hot_scores"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    hot_rank = Column(Float, nullable=True)  # NULL: 남은 점수 없음
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_post_hot_scores_hot_rank_post_id", "hot_rank", "post_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Boolean
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -16,6 +16,11 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
     comment = relationship("Comment", back_populates="notifications")
 
+    __table_args__ = (
+        # 알림함 커서 페이지네이션: user_id 로 좁힌 뒤 (created_at, id) 역순 스캔
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
 class Mention(Base):
     __tablename__ = "mentions"
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -20,7 +20,7 @@ class Report(Base):
     increase_slope = Column(Float, default=0)
     decrease_slope = Column(Float, default=0)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    route_id = Column(Integer, ForeignKey("routes.id"))
+    route_id = Column(Integer, ForeignKey("routes.id"), index=True)
 
     route = relationship("Route", back_populates="reports")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
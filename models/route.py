@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -16,6 +16,23 @@ class Route(Base):
     end_point = Column(JSONB, nullable=True)
     points_json = Column(JSONB)  # 보정된 좌표들을 저장할 JSONB 필드
 
+    # start_point / end_point / points_json 에서 파생된 검색용 좌표 (utils/events.py 에서 채움)
+    start_lat = Column(Float, nullable=True)
+    start_lon = Column(Float, nullable=True)
+    end_lat = Column(Float, nullable=True)
+    end_lon = Column(Float, nullable=True)
+    min_lat = Column(Float, nullable=True)
+    min_lon = Column(Float, nullable=True)
+    max_lat = Column(Float, nullable=True)
+    max_lon = Column(Float, nullable=True)
+    # 목록용 썸네일: points_json 을 최대 32개 [lat, lon] 로 단순화 (utill/geo.simplify_polyline)
+    thumbnail_polyline = Column(JSONB, nullable=True)
+
+    __table_args__ = (
+        Index("ix_routes_start_lat_lon", "start_lat", "start_lon"),
+        Index("ix_routes_end_lat_lon", "end_lat", "end_lon"),
+        Index("ix_routes_bbox", "min_lat", "max_lat", "min_lon", "max_lon"),
+    )
 
     author = relationship("User", back_populates="routes")
     reports = relationship("Report", back_populates="route", cascade="all, delete-orphan")
\ No newline at end of file
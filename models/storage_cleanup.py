@@ -0,0 +1,15 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+
+class StorageCleanup(Base):
+    """Storage file waiting to be deleted. Rows are written in the same transaction that drops the reference."""
+    __tablename__ = "storage_cleanup_queue"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    url = Column(String(500), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(String(500), nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
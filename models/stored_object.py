@@ -0,0 +1,16 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from sqlalchemy.sql import func
+from database import Base
+
+
+class StoredObject(Base):
+    """Content-addressed file or presigned upload that can be referenced by several posts or profiles.
+
+    The file is only deleted once ref_count drops back to zero.
+    """
+    __tablename__ = "stored_objects"
+
+    url = Column(String(500), primary_key=True)
+    size = Column(BigInteger, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -13,6 +13,7 @@ class User(Base):
     profile_pic = Column(String, nullable=True)
     fcm_token = Column(String, nullable=True) # For FCM push notifications
     fcm_token_updated_at = Column(DateTime(timezone=True), nullable=True)
+    unread_notification_count = Column(Integer, default=0, server_default="0", nullable=False)  # 알림 생성/읽음 처리 시 갱신
 
     google_id = Column(String, unique=True, nullable=True)
     naver_id = Column(String, unique=True, nullable=True)
@@ -1,5 +1,4 @@
-
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from starlette import status
@@ -7,13 +6,19 @@ from starlette import status
 from models import User
 from schemas.community import (
     PostUpdate, PostResponse, CommentResponse,
-    CommentCreate, CommentUpdate, Comment as CommentSchema, PostSearchResponse, PostCreateResponse
+    CommentCreate, CommentUpdate, Comment as CommentSchema, PostListItem, PostCreateResponse,
+    ViewerStateRequest, ViewerStateResponse, TrendingTag, CommentThreadResponse
 )
 from database import get_db
 from utils.auth import get_current_user
 from storage.base import BaseStorage
 from dependencies import get_storage_manager
+from utill.cursor import NEXT_CURSOR_HEADER
+from utill.serialization import AdapterJSONResponse, list_adapter
 from services import community as community_service
+from services import tag_trends as tag_trends_service
+from services import search as search_service
+from services import hot_posts as hot_posts_service
 from pydantic import BaseModel
 
 from services.impl.board_default_select import DefaultBoardSelectService
@@ -22,21 +27,102 @@ from services.impl.board_location_first_select import LocationBoardSelectService
 router = APIRouter(prefix="/post", tags=["community"])
 
 
+def _post_list_response(
+    posts: List[PostListItem], next_page_cursor: Optional[str] = None, body: Optional[bytes] = None
+) -> Response:
+    """목록 응답. response_model 검증 없이 바로 직렬화하고, 캐시된 body 가 있으면 그대로 보낸다."""
+    headers = {NEXT_CURSOR_HEADER: next_page_cursor} if next_page_cursor else None
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    return AdapterJSONResponse(posts, list_adapter(PostListItem), headers=headers)
+
+
 # ---------------------- 게시글 ----------------------
-@router.get("", response_model=list[PostSearchResponse])
+@router.get("", response_model=List[PostListItem])
 def get_boards(
     db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값. 지정하면 page 는 무시됩니다."),
     user_lat: Optional[float] = Query(None),
     user_lon: Optional[float] = Query(None),
+    radius_km: float = Query(30.0, gt=0, le=100),
+    include_viewer_state: bool = Query(False, description="is_liked / is_bookmarked 포함 여부"),
+    tag: Optional[str] = Query(None, max_length=11, description="해시태그 검색 (# 생략 가능). 위치 기반 조회와 함께 쓰면 무시됩니다."),
 ):
+    body = next_page_cursor = None
     if user_lat is not None and user_lon is not None:
-        service = LocationBoardSelectService()
-        return service.select(db, user_lat, user_lon)
+        service = LocationBoardSelectService(radius_km=radius_km)
+        posts, next_page_cursor = service.select_page(db, user_lat, user_lon, page=page, page_size=page_size, cursor=cursor)
     else:
-        service = DefaultBoardSelectService()
-        return service.select(db, page=page, page_size=page_size)
+        if tag:
+            tag = tag_trends_service.normalize_tag(tag)
+        cached = None
+        if cursor is None and not tag:
+            cached = community_service.get_cached_feed_page(db, page, page_size)
+        if cached is not None:
+            posts, body, next_page_cursor = cached
+        else:
+            service = DefaultBoardSelectService()
+            posts, next_page_cursor = service.select_page(db, page=page, page_size=page_size, cursor=cursor, tag=tag or None)
+
+    if include_viewer_state:
+        return _post_list_response(community_service.apply_viewer_state(db, current_user, posts), next_page_cursor)
+    return _post_list_response(posts, next_page_cursor, body)
+
+
+@router.get("/search", response_model=List[PostListItem])
+def search_posts(
+    q: str = Query(..., min_length=1, max_length=100, description="제목/본문 검색어"),
+    page_size: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값"),
+    include_viewer_state: bool = Query(False, description="is_liked / is_bookmarked 포함 여부"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    posts, next_page_cursor = search_service.search_posts(db, q, page_size, cursor)
+    if include_viewer_state:
+        posts = community_service.apply_viewer_state(db, current_user, posts)
+    return _post_list_response(posts, next_page_cursor)
+
+
+@router.get("/hot", response_model=List[PostListItem])
+def get_hot_boards(
+    page_size: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값"),
+    include_viewer_state: bool = Query(False, description="is_liked / is_bookmarked 포함 여부"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    posts, body, next_page_cursor = hot_posts_service.get_cached_hot_page(db, page_size, cursor)
+    if include_viewer_state:
+        return _post_list_response(community_service.apply_viewer_state(db, current_user, posts), next_page_cursor)
+    return _post_list_response(posts, next_page_cursor, body)
+
+
+@router.get("/tags/trending", response_model=List[TrendingTag])
+def get_trending_tags(limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+    return tag_trends_service.get_trending_tags(db, limit)
+
+
+@router.post("/viewer-state", response_model=ViewerStateResponse)
+def get_viewer_state(
+    request: ViewerStateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return community_service.get_viewer_state(request, db, current_user)
+
+
+@router.get("/feed-cache/stats", response_model=dict)
+def get_feed_cache_stats(current_user: User = Depends(get_current_user)):
+    return community_service.get_feed_cache_stats(current_user)
+
+
+@router.get("/storage-cleanup/stats", response_model=dict)
+def get_storage_cleanup_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return community_service.get_storage_cleanup_stats(db, current_user)
 
 
 @router.post("", response_model=PostCreateResponse)
@@ -46,7 +132,7 @@ def create_board(
     storage: BaseStorage = Depends(get_storage_manager),
     post_data: str = Form(...),
     images: Optional[List[UploadFile]] = File(None),
-    map_image: UploadFile = File(...),
+    map_image: Optional[UploadFile] = File(None),
 ):
     return community_service.create_board(db, current_user, storage, post_data, images, map_image)
 
@@ -54,9 +140,10 @@ def create_board(
 @router.get("/{post_id}", response_model=PostResponse)
 def get_board(
     post_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
 ):
-    return community_service.get_board(post_id, db)
+    return community_service.get_board(post_id, db, current_user)
 
 
 @router.patch("/{post_id}", response_model=PostResponse)
@@ -97,6 +184,24 @@ def get_all_comment(post_id: int, db: Session = Depends(get_db)):
     return community_service.get_all_comment(post_id, db)
 
 
+@router.get("/{post_id}/comments/thread", response_model=List[CommentThreadResponse])
+def get_comment_thread(
+    post_id: int,
+    response: Response,
+    page_size: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값"),
+    replies_per_comment: int = Query(community_service.COMMENT_THREAD_REPLIES_PER_COMMENT, ge=0, le=100, description="댓글마다 불러올 답글 수 (오래된 순)"),
+    max_depth: int = Query(community_service.COMMENT_THREAD_MAX_DEPTH, ge=0, le=30),
+    db: Session = Depends(get_db),
+):
+    comments, next_page_cursor = community_service.get_comment_thread(
+        post_id, db, page_size, cursor, replies_per_comment, max_depth
+    )
+    if next_page_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_page_cursor
+    return comments
+
+
 @router.patch("/comments/{comment_id}", response_model=CommentSchema)
 def update_comment(comment_id: int, comment_update: CommentUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return community_service.update_comment(comment_id, comment_update, db, current_user)
@@ -122,40 +227,50 @@ def check_comment_liked_status(comment_id: int, db: Session = Depends(get_db), c
     return community_service.check_comment_liked_status(comment_id, db, current_user)
 
 
-@router.get("/me/bookmarked", response_model=List[PostSearchResponse])
+@router.get("/me/bookmarked", response_model=List[PostListItem])
 def get_my_bookmarked_posts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_viewer_state: bool = Query(False)
 ):
-    return community_service.get_my_bookmarked_posts(current_user, db, page, page_size)
+    posts, next_page_cursor = community_service.get_my_bookmarked_posts(current_user, db, page, page_size, cursor)
+    if include_viewer_state:
+        posts = community_service.apply_viewer_state(db, current_user, posts)
+    return _post_list_response(posts, next_page_cursor)
 
 
-@router.get("/me/posts", response_model=List[PostSearchResponse])
+@router.get("/me/posts", response_model=List[PostListItem])
 def get_my_posts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1),
-    page_size: int = Query(10, ge=1, le=100)
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_viewer_state: bool = Query(False)
 ):
-    return community_service.get_my_posts(current_user, db, page, page_size)
+    posts, next_page_cursor = community_service.get_my_posts(current_user, db, page, page_size, cursor)
+    if include_viewer_state:
+        posts = community_service.apply_viewer_state(db, current_user, posts)
+    return _post_list_response(posts, next_page_cursor)
 
 
-@router.get("/me/posts/recent", response_model=List[PostSearchResponse])
+@router.get("/me/posts/recent", response_model=List[PostListItem])
 def get_my_recent_posts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return community_service.get_my_recent_posts(current_user, db)
+    return _post_list_response(community_service.get_my_recent_posts(current_user, db))
 
 
-@router.get("/me/bookmarked/recent", response_model=List[PostSearchResponse])
+@router.get("/me/bookmarked/recent", response_model=List[PostListItem])
 def get_my_recent_bookmarked_posts(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return community_service.get_my_recent_bookmarked_posts(current_user, db)
+    return _post_list_response(community_service.get_my_recent_bookmarked_posts(current_user, db))
 
 
 @router.post("/{post_id}/bookmark", status_code=status.HTTP_204_NO_CONTENT)
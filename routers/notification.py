@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from database import get_db
+from models.user import User
+from schemas.notification import NotificationResponse, NotificationReadRequest, UnreadCountResponse
+from services import notification as notification_service
+from services.notification_stream import unread_count_events
+from utils.auth import get_current_user
+from utill.cursor import NEXT_CURSOR_HEADER
+
+router = APIRouter(
+    prefix="/notifications",
+    tags=["notifications"]
+)
+
+@router.get("", response_model=List[NotificationResponse])
+def get_notifications(
+    response: Response,
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor 헤더 값"),
+    unread_only: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    notifications, next_page_cursor = notification_service.list_notifications(
+        db, current_user, page_size, cursor, unread_only
+    )
+    if next_page_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_page_cursor
+    return notifications
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+def get_unread_count(current_user: User = Depends(get_current_user)):
+    return {"unread_count": notification_service.get_unread_count(current_user)}
+
+@router.post("/read", response_model=UnreadCountResponse)
+def mark_notifications_read(
+    request: NotificationReadRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return {"unread_count": notification_service.mark_notifications_read(db, current_user, request.ids)}
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_notifications(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    """Server-Sent Events: 연결 직후와 안 읽은 알림 수가 바뀔 때마다 `unread_count` 이벤트를 보낸다."""
+    user_id, unread_count = current_user.id, notification_service.get_unread_count(current_user)
+    db.close()  # 스트림이 열려 있는 동안 DB 커넥션을 붙잡지 않도록 바로 반납
+    return StreamingResponse(
+        unread_count_events(user_id, unread_count),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -27,6 +27,31 @@ def get_my_routes(
     """특정 유저의 경로를 불러올 수 있음."""
     return route_service.get_my_routes(db, current_user, page, page_size)
 
+@router.get("/nearby", response_model=List[route_schema.RouteNearbyResponse])
+def get_routes_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=100),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """출발점이 내 위치 반경 안에 있는 경로를 가까운 순으로 조회합니다."""
+    return route_service.get_routes_nearby(db, lat, lon, radius_km, page, page_size)
+
+@router.get("/viewport", response_model=List[route_schema.RouteNearbyResponse])
+def get_routes_in_viewport(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """지도 화면 영역과 겹치는 경로를 화면 중심에서 가까운 순으로 조회합니다."""
+    return route_service.get_routes_in_viewport(db, min_lat, min_lon, max_lat, max_lon, page, page_size)
+
 @router.get("/{route_id}", response_model=route_schema.Route)
 def get_route_by_id(route_id: int, db: Session = Depends(get_db)):
     """ID로 특정 경로를 조회합니다."""
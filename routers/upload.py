@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Request, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from models.user import User
+from schemas.upload import PresignRequest, PresignedUpload
+from database import get_db
+from utils.auth import get_current_user
+from storage.base import BaseStorage
+from dependencies import get_storage_manager
+from services import upload as upload_service
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+
+@router.post("/presign", response_model=List[PresignedUpload])
+def presign_uploads(
+    request: PresignRequest,
+    db: Session = Depends(get_db),
+    storage: BaseStorage = Depends(get_storage_manager),
+    current_user: User = Depends(get_current_user)
+):
+    """이미지를 API 서버를 거치지 않고 스토리지에 직접 업로드할 URL을 발급합니다."""
+    return upload_service.presign_uploads(db, request, storage, current_user)
+
+
+@router.put("/uploads/{token}", status_code=status.HTTP_204_NO_CONTENT)
+async def receive_signed_upload(token: str, request: Request, storage: BaseStorage = Depends(get_storage_manager)):
+    """LocalStorage 사용 시 presign으로 발급된 업로드 URL입니다. 토큰 자체가 인증 수단입니다."""
+    await upload_service.receive_signed_upload(
+        token, request.headers.get("content-type", ""), request.stream(), storage
+    )
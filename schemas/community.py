@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, field_validator, computed_field, model_validator
+from pydantic import BaseModel, Field, field_validator, computed_field
 from typing import Optional, List, Dict, Any
+from typing_extensions import TypedDict
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -22,6 +23,7 @@ class PostResponse(BaseModel):
     content: str
     like_count: int
     read_count: int
+    unique_viewer_count: int = 0
     comment_count: int = 0
     user_id: Optional[int] = None
     report: Optional[ReportWithRouteResponse] = None
@@ -107,6 +109,8 @@ class PostCreate(BaseModel):
     speed: Optional[float] = None
     distance: Optional[float] = None
     time: Optional[float] = None
+    map_image_key: Optional[str] = None # POST /storage/presign 으로 직접 업로드한 키
+    image_keys: List[str] = Field(default_factory=list, max_length=10)
 
     class Config:
         from_attributes = True
@@ -115,6 +119,9 @@ class PostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
     images_to_keep_ids: Optional[List[int]] = None # New field
+    map_image_key: Optional[str] = None
+    new_image_keys: List[str] = Field(default_factory=list, max_length=10)
+    hash_tag: Optional[List[str]] = None
 
 
 class PostCreateResponse(BaseModel):
@@ -161,65 +168,55 @@ class PostCreateResponse(BaseModel):
         json_encoders = {datetime: convert_datetime_to_korea_time}
 
 
-class PostSearchResponse(BaseModel):
+# ---------- Post list item ----------
+# 목록 응답은 SQL 결과 튜플로 바로 만든 dict 를 그대로 직렬화한다 (검증/computed_field 없음).
+# services/abstract/board_select.post_list_items 가 채우고 utill/serialization 으로 내보낸다.
+
+class ImageItem(TypedDict):
+    id: int
+    url: str
+
+class PostListItem(TypedDict):
     id: int
     title: str
     content: str
     like_count: int
     read_count: int
-    comment_count: int = 0
-    user_id: Optional[int] = None
-    report_id: Optional[int] = None
-    route_id: Optional[int] = None
-    created_at: datetime
-    images: List[Image] = []
+    comment_count: int
+    user_id: Optional[int]
+    report_id: Optional[int]
+    route_id: Optional[int]
+    created_at: datetime  # Asia/Seoul 기준
+    images: List[ImageItem]
     hash_tag: List[str]
     public: bool
-    map_image_url: Optional[str] = None
-    report: Optional[ReportWithRouteResponse] = Field(None, exclude=True)
-    route_name: Optional[str] = None # New field for route name
-
-    @model_validator(mode='after')
-    def populate_route_id(self) -> 'PostSearchResponse':
-        if self.report and self.report.route:
-            self.route_id = self.report.route.id
-        return self
-
-    @field_validator('hash_tag', mode='before')
-    @classmethod
-    def hashtags_to_empty_list(cls, v):
-        if v is None:
-            return []
-        return v
-
-    @computed_field
-    @property
-    def speed(self) -> Optional[float]:
-        if self.report:
-            return self.report.average_speed
-        return None
-
-    @computed_field
-    @property
-    def distance(self) -> Optional[float]:
-        if self.report:
-            return self.report.distance
-        return None
+    map_image_url: Optional[str]
+    route_name: Optional[str]
+    is_liked: Optional[bool]  # include_viewer_state=true 일 때만 채워짐
+    is_bookmarked: Optional[bool]
+    speed: Optional[float]
+    distance: Optional[float]
+    time: Optional[str]  # HH:MM:SS
+    route_thumbnail: Optional[List[List[float]]]
+
+# ---------- Viewer State ----------
+
+class ViewerStateRequest(BaseModel):
+    post_ids: List[int] = Field(default_factory=list, max_length=100)
+    comment_ids: List[int] = Field(default_factory=list, max_length=200)
+
+class PostViewerState(BaseModel):
+    id: int
+    is_liked: bool
+    is_bookmarked: bool
 
-    @computed_field
-    @property
-    def time(self) -> Optional[str]:
-        if self.report and self.report.health_time is not None:
-            total_seconds = self.report.health_time
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        return None
+class CommentViewerState(BaseModel):
+    id: int
+    is_liked: bool
 
-    class Config:
-        from_attributes = True
-        json_encoders = {datetime: convert_datetime_to_korea_time}
+class ViewerStateResponse(BaseModel):
+    posts: List[PostViewerState] = []
+    comments: List[CommentViewerState] = []
 
 # ---------- Comment (New Recursive Structure) ----------
 
@@ -287,4 +284,15 @@ class CommentResponse(BaseModel):
         return self.author.profile_pic if self.author else None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CommentThreadResponse(CommentResponse):
+    reply_count: int = 0  # 직속 답글 수. len(replies) 보다 크면 나머지는 /comments/{id}/replies 로 조회
+    replies: List["CommentThreadResponse"] = []
+
+# ---------- Hashtag ----------
+
+class TrendingTag(BaseModel):
+    tag: str
+    score: float
+    post_count: int
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+
+
+class NotificationResponse(BaseModel):
+    id: int
+    type: str
+    message: str
+    comment_id: Optional[int] = None
+    is_read: bool = False
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationReadRequest(BaseModel):
+    ids: Optional[List[int]] = Field(None, max_length=500, description="읽음 처리할 알림 ID. 생략하면 전체 읽음 처리")
+
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
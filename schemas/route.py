@@ -21,4 +21,16 @@ class RouteWithReportsResponse(BaseModel):
 
     class Config:
         from_attributes = True
-        json_encoders = {datetime: convert_datetime_to_korea_time}
\ No newline at end of file
+        json_encoders = {datetime: convert_datetime_to_korea_time}
+class RouteNearbyResponse(BaseModel):
+    id: int
+    name: Optional[str] = None
+    user_id: Optional[int] = None
+    created_at: datetime
+    start_point: Optional[Dict[str, Any]] = None
+    end_point: Optional[Dict[str, Any]] = None
+    distance_km: float
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: convert_datetime_to_korea_time}
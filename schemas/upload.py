@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List, Dict, Literal, Optional
+from datetime import datetime
+
+
+class UploadFileSpec(BaseModel):
+    filename: Optional[str] = None
+    content_type: str
+    size: int = Field(..., gt=0)
+
+class PresignRequest(BaseModel):
+    purpose: Literal["board", "profile"]
+    files: List[UploadFileSpec] = Field(..., min_length=1, max_length=10)
+
+class PresignedUpload(BaseModel):
+    key: str
+    upload_url: str
+    method: str
+    headers: Dict[str, str]
+    expires_at: datetime
@@ -20,6 +20,7 @@ class UserUpdate(BaseModel):
     username: Optional[str] = None
     profile_description: Optional[str] = None
     profile_pic: Optional[str] = None # Re-add this
+    profile_pic_key: Optional[str] = None # POST /storage/presign 으로 직접 업로드한 키
 
 # New schema for OAuth callbacks
 class TokenUserResponse(BaseModel):
@@ -0,0 +1,102 @@
+"""
+Payload-size regression check for the post list endpoints.
+
+Requests one page from every feed endpoint of a running server and reports
+items, response bytes, bytes per item and median latency. Exits with status 1
+if any endpoint exceeds --max-bytes-per-item or if a list item carries fields
+that belong to the detail view (full route geometry, nested report, author).
+Run it against a server with representative data, e.g. posts with long routes:
+
+    python -m scripts.feed_payload_benchmark --token <access token> --lat 37.55 --lon 127.05
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+
+# 목록 항목에 다시 들어오면 안 되는 상세 전용 필드
+FORBIDDEN_ITEM_KEYS = ("points_json", "report", "author")
+DEFAULT_MAX_BYTES_PER_ITEM = 2048
+
+
+def _endpoints(args) -> List[Tuple[str, str, dict]]:
+    page = {"page_size": args.page_size}
+    endpoints = [
+        ("feed", "/post", page),
+        ("tag", "/post", {**page, "tag": args.tag}),
+        ("search", "/post/search", {**page, "q": args.query}),
+        ("hot", "/post/hot", page),
+        ("mine", "/post/me/posts", page),
+        ("bookmarked", "/post/me/bookmarked", page),
+    ]
+    if args.lat is not None and args.lon is not None:
+        endpoints.append(("near", "/post", {**page, "user_lat": args.lat, "user_lon": args.lon}))
+    return endpoints
+
+
+def measure(client: httpx.Client, path: str, params: dict, repeat: int) -> Tuple[httpx.Response, float]:
+    """Last response and the median latency in ms over repeat requests."""
+    timings = []
+    response = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, params=params)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return response, statistics.median(timings)
+
+
+def check_endpoint(name: str, response: httpx.Response, max_bytes_per_item: int) -> Tuple[Optional[int], List[str]]:
+    """Bytes per item (None for an empty page) and the problems found."""
+    items = response.json()
+    if not items:
+        return None, []
+    problems = []
+    per_item = len(response.content) // len(items)
+    if per_item > max_bytes_per_item:
+        problems.append(f"{name}: {per_item} B/item exceeds {max_bytes_per_item} B/item")
+    leaked = sorted({key for item in items for key in FORBIDDEN_ITEM_KEYS if key in item})
+    if leaked:
+        problems.append(f"{name}: list items contain {', '.join(leaked)}")
+    return per_item, problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("BENCH_TOKEN"), help="access token (or BENCH_TOKEN)")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tag", default="러닝")
+    parser.add_argument("--query", default="러닝")
+    parser.add_argument("--lat", type=float)
+    parser.add_argument("--lon", type=float)
+    parser.add_argument("--max-bytes-per-item", type=int, default=DEFAULT_MAX_BYTES_PER_ITEM)
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error("--token or BENCH_TOKEN is required")
+
+    problems = []
+    headers = {"Authorization": f"Bearer {args.token}"}
+    with httpx.Client(base_url=args.base_url, headers=headers, timeout=30) as client:
+        print(f"{'endpoint':12s} {'items':>5s} {'bytes':>8s} {'B/item':>7s} {'median':>9s}")
+        for name, path, params in _endpoints(args):
+            response, median_ms = measure(client, path, params, args.repeat)
+            per_item, endpoint_problems = check_endpoint(name, response, args.max_bytes_per_item)
+            problems.extend(endpoint_problems)
+            print(
+                f"{name:12s} {len(response.json()):5d} {len(response.content):8d} "
+                f"{per_item if per_item is not None else '-':>7} {median_ms:7.1f}ms"
+            )
+
+    for problem in problems:
+        print(f"FAIL {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Contention benchmark for post likes: many users liking one post at once.
+
+Compares the two ways of counting a like on the same hot post:
+
+- row_update: the previous implementation, which ran
+  UPDATE posts SET like_count = like_count + 1 inside every like transaction,
+  so concurrent likers queue on the post row's lock.
+- events: the current toggle_post_like, which appends to post_like_events and
+  lets services/like_counter fold the deltas later.
+
+Each run creates --likers throwaway users and one post, lets every user like
+the post once from --concurrency connections (all released together),
+checks the final like_count and then deletes everything it created. The
+events run folds the pending events before checking, so point it at a
+development database:
+
+    python -m scripts.like_contention_benchmark --likers 500 --concurrency 64
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, delete, func, insert, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from database import engine
+from models import Post, PostLikeEvent, User
+from models.community import post_likes
+from services import community as community_service
+from services.like_counter import fold_post_like_events
+
+
+def _like_with_row_update(db: Session, post_id: int, user: User) -> None:
+    """The pre-event implementation: link row plus an in-place like_count update."""
+    inserted = db.execute(insert(post_likes).values(user_id=user.id, post_id=post_id)).rowcount
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(like_count=func.coalesce(Post.like_count, 0) + inserted)
+        .returning(Post.like_count)
+    ).scalar_one()
+    db.commit()
+
+
+def _like_with_events(db: Session, post_id: int, user: User) -> None:
+    community_service.toggle_post_like(post_id, db, user)
+
+
+STRATEGIES: Dict[str, Callable[[Session, int, User], None]] = {
+    "row_update": _like_with_row_update,
+    "events": _like_with_events,
+}
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run(strategy: str, likers: int, concurrency: int) -> dict:
+    bench_engine = create_engine(engine.url, pool_size=concurrency, max_overflow=0)
+    BenchSession = sessionmaker(bind=bench_engine, autoflush=False)
+    run_id = uuid.uuid4().hex[:8]
+
+    with BenchSession() as db:
+        user_ids = [
+            row[0] for row in db.execute(
+                insert(User).returning(User.id),
+                [
+                    {"email": f"like-bench-{run_id}-{i}@example.invalid", "username": f"lb{run_id}{i}", "hashed_password": "-"}
+                    for i in range(likers)
+                ],
+            )
+        ]
+        post_id = db.execute(
+            insert(Post).values(title="like benchmark", content="-", user_id=user_ids[0], public=False, like_count=0, read_count=0)
+            .returning(Post.id)
+        ).scalar_one()
+        db.commit()
+
+    like = STRATEGIES[strategy]
+    start = threading.Barrier(concurrency)
+    latencies: List[float] = []
+    errors: List[Exception] = []
+    lock = threading.Lock()
+
+    def worker(chunk: List[int]) -> None:
+        start.wait()
+        for user_id in chunk:
+            with BenchSession() as db:
+                user = db.get(User, user_id)
+                started = time.perf_counter()
+                try:
+                    like(db, post_id, user)
+                except Exception as e:
+                    with lock:
+                        errors.append(e)
+                    continue
+                elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed * 1000)
+
+    chunks = [user_ids[i::concurrency] for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, chunks))
+    total_seconds = time.perf_counter() - started
+
+    with BenchSession() as db:
+        if strategy == "events":
+            fold_post_like_events(db)
+        like_count = db.query(Post.like_count).filter(Post.id == post_id).scalar()
+        db.execute(delete(PostLikeEvent).where(PostLikeEvent.post_id == post_id))
+        db.execute(delete(post_likes).where(post_likes.c.post_id == post_id))
+        db.execute(delete(Post).where(Post.id == post_id))
+        db.execute(delete(User).where(User.id.in_(user_ids)))
+        db.commit()
+    bench_engine.dispose()
+
+    latencies.sort()
+    return {
+        "strategy": strategy,
+        "likes_per_second": len(latencies) / total_seconds,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": _percentile(latencies, 0.95) if latencies else 0.0,
+        "p99_ms": _percentile(latencies, 0.99) if latencies else 0.0,
+        "max_ms": latencies[-1] if latencies else 0.0,
+        "like_count": like_count,
+        "expected": likers,
+        "errors": len(errors),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--likers", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=64, help="database connections used at once")
+    parser.add_argument("--strategy", choices=[*STRATEGIES, "all"], default="all")
+    args = parser.parse_args(argv)
+
+    strategies = list(STRATEGIES) if args.strategy == "all" else [args.strategy]
+    print(f"{args.likers} likers on one post, {args.concurrency} concurrent connections")
+    print(f"{'strategy':12s} {'likes/s':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'max':>8s} {'count':>7s}")
+    ok = True
+    for strategy in strategies:
+        result = run(strategy, args.likers, args.concurrency)
+        ok = ok and result["like_count"] == result["expected"] and not result["errors"]
+        print(
+            f"{result['strategy']:12s} {result['likes_per_second']:8.0f} {result['p50_ms']:6.1f}ms "
+            f"{result['p95_ms']:6.1f}ms {result['p99_ms']:6.1f}ms {result['max_ms']:6.1f}ms "
+            f"{result['like_count']:>4}/{result['expected']}" + (f"  errors={result['errors']}" if result["errors"] else "")
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Serialization cost of post list pages, per 100 posts.
+
+Inserts --posts posts under a throwaway user, each with a route, a report and
+--images images, the shape of a busy feed page. Then it times the three steps
+of every list endpoint:
+
+- query: feed_post_query for those posts
+- build: post_list_items, the dicts plus the single images query
+- dump: list_adapter(PostListItem).dump_json, what AdapterJSONResponse sends
+
+For comparison it also times validate+dump, the cost of letting FastAPI
+validate the items against response_model before serializing them. Times are
+medians scaled to 100 posts. Everything it created is deleted at the end:
+
+    python -m scripts.list_serialization_benchmark --posts 100 --repeat 200
+"""
+import argparse
+import math
+import statistics
+import sys
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, insert, select
+
+from database import SessionLocal
+from models import Image, Post, Report, Route, User
+from schemas.community import PostListItem
+from services.abstract.board_select import feed_post_query, post_list_items
+from utill.serialization import list_adapter
+from utils import events  # noqa: F401  Route.thumbnail_polyline 등을 채우는 리스너 등록
+
+ROUTE_POINTS = 2000
+
+
+def _route_points(index: int) -> List[dict]:
+    lat, lon = 37.5 + index * 0.001, 127.0 + index * 0.001
+    return [
+        {"lat": lat + 0.0001 * k + 0.00005 * math.sin(k / 7), "lon": lon + 0.0001 * k * math.cos(k / 50)}
+        for k in range(ROUTE_POINTS)
+    ]
+
+
+def seed(posts: int, images: int) -> int:
+    """Create posts posts with a route, a report and images each; returns the owner's id."""
+    with SessionLocal() as db:
+        run_id = uuid.uuid4().hex[:8]
+        user = User(email=f"list-bench-{run_id}@example.invalid", username=f"lsb{run_id}", hashed_password="-")
+        db.add(user)
+        db.flush()
+        for i in range(posts):
+            points = _route_points(i)
+            route = Route(name=f"벤치마크 코스 {i}", user_id=user.id, start_point=points[0], end_point=points[-1], points_json=points)
+            db.add(route)
+            db.flush()
+            report = Report(route_id=route.id, user_id=user.id, distance=10.5, health_time=3725, average_speed=9.8)
+            db.add(report)
+            db.flush()
+            post = Post(
+                title=f"한강 러닝 {i}", content="오늘도 한강에서 달렸다. " * 20, user_id=user.id, report_id=report.id,
+                public=True, hash_tag=["한강", "러닝"], like_count=i, read_count=i * 3,
+            )
+            db.add(post)
+            db.flush()
+            db.add_all(Image(post_id=post.id, url=f"/uploads/board/{uuid.uuid4()}.jpg") for _ in range(images))
+        db.commit()
+        return user.id
+
+
+def cleanup(user_id: int) -> None:
+    with SessionLocal() as db:
+        post_ids = select(Post.id).where(Post.user_id == user_id).scalar_subquery()
+        db.execute(delete(Image).where(Image.post_id.in_(post_ids)))
+        db.execute(delete(Post).where(Post.user_id == user_id))
+        db.execute(delete(Report).where(Report.user_id == user_id))
+        db.execute(delete(Route).where(Route.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+
+
+def _timed(fn: Callable[[], object], timings: List[float]):
+    started = time.perf_counter()
+    result = fn()
+    timings.append((time.perf_counter() - started) * 1000)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--images", type=int, default=3, help="images per post")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    adapter = list_adapter(PostListItem)
+    user_id = seed(args.posts, args.images)
+    try:
+        stages = {"query": [], "build": [], "dump": [], "validate+dump": []}
+        body = b""
+        with SessionLocal() as db:
+            for _ in range(args.repeat):
+                rows = _timed(lambda: feed_post_query(db).filter(Post.user_id == user_id).order_by(Post.id).all(), stages["query"])
+                items = _timed(lambda: post_list_items(db, rows), stages["build"])
+                body = _timed(lambda: adapter.dump_json(items), stages["dump"])
+                _timed(lambda: adapter.dump_json(adapter.validate_python(items)), stages["validate+dump"])
+    finally:
+        cleanup(user_id)
+
+    scale = 100 / args.posts
+    print(f"{args.posts} posts x {args.images} images, {len(body)} bytes ({len(body) // args.posts} B/post), {args.repeat} runs")
+    print(f"{'stage':14s} {'per 100 posts':>14s}")
+    for stage, timings in stages.items():
+        print(f"{stage:14s} {statistics.median(timings) * scale:12.2f}ms")
+    sent = sum(statistics.median(stages[stage]) for stage in ("build", "dump")) * scale
+    print(f"{'build+dump':14s} {sent:12.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Latency benchmark for the location feed (GET /post?user_lat=&user_lon=).
+
+Times LocationBoardSelectService.select_page for the first page, the next page
+reached with its cursor, and a deep page reached both ways: page=--deep-page
+with OFFSET, and by following cursors to the same depth (only the last hop is
+timed). With --seed N it first inserts N synthetic routes, reports and public
+posts under a throwaway user. --hotspot of them start within about 30 km of
+--lat/--lon, and the rest are spread over South Korea. They are deleted
+afterwards unless --keep is given. Run it against a development database:
+
+    python -m scripts.nearby_benchmark --seed 1000000 --lat 37.55 --lon 126.98
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, insert, text
+
+from database import SessionLocal, engine
+from models import Post, Report, Route, User
+from services.impl.board_location_first_select import DEFAULT_RADIUS_KM, LocationBoardSelectService
+
+SEED_BATCH = 200_000
+# Rough bounds of South Korea: lat 33.2..38.5, lon 126.1..129.4
+COUNTRY_LAT, COUNTRY_LAT_SPAN = 33.2, 5.3
+COUNTRY_LON, COUNTRY_LON_SPAN = 126.1, 3.3
+HOTSPOT_SPAN_DEG = 0.5
+
+
+def seed_posts(count: int, lat: float, lon: float, hotspot: float) -> int:
+    """Insert count route/report/post triples and return the id of the user that owns them."""
+    with SessionLocal() as db:
+        run_id = uuid.uuid4().hex[:8]
+        user_id = db.execute(
+            insert(User).values(email=f"nearby-bench-{run_id}@example.invalid", username=f"nb{run_id}", hashed_password="-")
+            .returning(User.id)
+        ).scalar_one()
+        db.commit()
+
+    # start_lat/start_lon and the bbox columns are what utils.events fills for real routes.
+    seed = text("""
+        WITH points AS (
+            SELECT g,
+                   CASE WHEN random() < :hotspot THEN :lat + (random() - 0.5) * :span ELSE :country_lat + random() * :country_lat_span END AS lat,
+                   CASE WHEN random() < :hotspot THEN :lon + (random() - 0.5) * :span ELSE :country_lon + random() * :country_lon_span END AS lon
+            FROM generate_series(:start, :stop) AS g
+        ), new_routes AS (
+            INSERT INTO routes (name, user_id, start_point, end_point, start_lat, start_lon, end_lat, end_lon, min_lat, min_lon, max_lat, max_lon)
+            SELECT 'nearby bench ' || g, :user_id,
+                   jsonb_build_object('lat', lat, 'lon', lon), jsonb_build_object('lat', lat, 'lon', lon),
+                   lat, lon, lat, lon, lat, lon, lat, lon
+            FROM points
+            RETURNING id
+        ), new_reports AS (
+            INSERT INTO reports (route_id, user_id, distance, health_time, average_speed)
+            SELECT id, :user_id, 5 + random() * 15, 1800 + (random() * 5400)::int, 8 + random() * 6
+            FROM new_routes
+            RETURNING id
+        )
+        INSERT INTO posts (title, content, user_id, report_id, public, like_count, read_count, hash_tag, created_at)
+        SELECT '근처 러닝', '벤치마크', :user_id, id, true, 0, 0, '{}', now() - random() * interval '365 days'
+        FROM new_reports
+    """)
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        for start in range(1, count + 1, SEED_BATCH):
+            stop = min(start + SEED_BATCH - 1, count)
+            conn.execute(seed, {
+                "start": start, "stop": stop, "user_id": user_id, "hotspot": hotspot, "lat": lat, "lon": lon,
+                "span": HOTSPOT_SPAN_DEG, "country_lat": COUNTRY_LAT, "country_lat_span": COUNTRY_LAT_SPAN,
+                "country_lon": COUNTRY_LON, "country_lon_span": COUNTRY_LON_SPAN,
+            })
+            conn.commit()
+            print(f"seeded {stop}/{count} posts ({time.perf_counter() - started:.0f}s)", file=sys.stderr)
+        for table in ("routes", "reports", "posts"):
+            conn.execute(text(f"ANALYZE {table}"))
+        conn.commit()
+    return user_id
+
+
+def remove_seeded_posts(user_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(Post).where(Post.user_id == user_id))
+        db.execute(delete(Report).where(Report.user_id == user_id))
+        db.execute(delete(Route).where(Route.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="synthetic posts to insert first")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded posts")
+    parser.add_argument("--lat", type=float, default=37.55)
+    parser.add_argument("--lon", type=float, default=126.98)
+    parser.add_argument("--radius-km", type=float, default=DEFAULT_RADIUS_KM)
+    parser.add_argument("--hotspot", type=float, default=0.5, help="share of seeded posts near --lat/--lon")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    user_id = seed_posts(args.seed, args.lat, args.lon, args.hotspot) if args.seed else None
+    service = LocationBoardSelectService(radius_km=args.radius_km)
+    try:
+        with SessionLocal() as db:
+            total = db.query(Post).filter(Post.public == True).count()
+            page = lambda **kw: service.select_page(db, args.lat, args.lon, page_size=args.page_size, **kw)
+
+            _, first_cursor = page()
+            cursor = first_cursor
+            for _ in range(args.deep_page - 2):
+                if cursor is None:
+                    break
+                _, cursor = page(cursor=cursor)
+
+            results = [("first page", _median_ms(lambda: page(), args.repeat))]
+            if first_cursor:
+                results.append(("next page (cursor)", _median_ms(lambda: page(cursor=first_cursor), args.repeat)))
+            results.append((f"page {args.deep_page} (offset)", _median_ms(lambda: page(page=args.deep_page), args.repeat)))
+            if cursor:
+                results.append((f"page {args.deep_page} (cursor)", _median_ms(lambda: page(cursor=cursor), args.repeat)))
+    finally:
+        if user_id is not None and not args.keep:
+            remove_seeded_posts(user_id)
+
+    print(f"{total} public posts, radius {args.radius_km} km around ({args.lat}, {args.lon}), page size {args.page_size}")
+    for name, median_ms in results:
+        print(f"{name:22s} {median_ms:8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
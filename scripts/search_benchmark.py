@@ -0,0 +1,150 @@
+"""
+Latency benchmark for post search over a large table.
+
+Times services.search.search_posts for a few queries: the first page, and the
+next page reached with the first page's cursor. With --seed N it first inserts N
+synthetic public posts under a throwaway user, built from a few thousand
+generated title/content templates with common, uncommon and rare words. The
+posts are deleted afterwards unless --keep is given. Without --seed it measures
+the posts already in the database. Run it against a development database:
+
+    python -m scripts.search_benchmark --seed 2000000 --query 러닝 --query "한강 공원" --query 트레일
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, insert, text
+
+from database import SessionLocal, engine
+from models import Post, User
+from services.search import search_posts
+from utill.search import search_tokens
+
+# (word, relative frequency): a few words in most posts, some in a few percent, some almost nowhere.
+VOCABULARY = [
+    ("러닝", 40), ("오늘", 30), ("코스", 25), ("기록", 20), ("산책", 15), ("run", 15),
+    ("한강", 8), ("공원", 8), ("새벽", 6), ("인터벌", 4), ("페이스", 4), ("10km", 3),
+    ("한강공원", 2), ("야간러닝", 1), ("트레일", 0.3), ("하프마라톤", 0.2), ("ultra", 0.05),
+]
+DEFAULT_QUERIES = ["러닝", "한강 공원", "페이스", "트레일", "ultra"]
+TEMPLATE_COUNT = 5000
+SEED_BATCH = 200_000
+
+
+def _templates(rng: random.Random) -> List[dict]:
+    words, weights = zip(*VOCABULARY)
+    templates = []
+    for template_id in range(TEMPLATE_COUNT):
+        title = " ".join(rng.choices(words, weights, k=rng.randint(2, 4)))
+        content = " ".join(rng.choices(words, weights, k=rng.randint(8, 24)))
+        templates.append({
+            "id": template_id,
+            "title": title,
+            "content": content,
+            "title_tokens": search_tokens(title),
+            "content_tokens": search_tokens(content),
+        })
+    return templates
+
+
+def seed_posts(count: int) -> int:
+    """Insert count synthetic public posts and return the id of the user that owns them."""
+    with SessionLocal() as db:
+        run_id = uuid.uuid4().hex[:8]
+        user_id = db.execute(
+            insert(User).values(email=f"search-bench-{run_id}@example.invalid", username=f"sb{run_id}", hashed_password="-")
+            .returning(User.id)
+        ).scalar_one()
+        db.commit()
+
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE TEMPORARY TABLE search_bench_templates "
+            "(id int PRIMARY KEY, title text, content text, title_tokens text, content_tokens text)"
+        ))
+        conn.execute(
+            text("INSERT INTO search_bench_templates VALUES (:id, :title, :content, :title_tokens, :content_tokens)"),
+            _templates(random.Random(42)),
+        )
+        # Same vector as utils.events.post_search_vector, computed from the pre-tokenized templates.
+        seed = text("""
+            INSERT INTO posts (title, content, user_id, public, like_count, read_count, hash_tag, created_at, search_vector)
+            SELECT t.title, t.content, :user_id, true, 0, 0, '{}', now() - g * interval '1 minute',
+                   setweight(to_tsvector('simple', t.title_tokens), 'A') || setweight(to_tsvector('simple', t.content_tokens), 'B')
+            FROM generate_series(:start, :stop) AS g
+            JOIN search_bench_templates AS t ON t.id = g % :templates
+        """)
+        started = time.perf_counter()
+        for start in range(1, count + 1, SEED_BATCH):
+            stop = min(start + SEED_BATCH - 1, count)
+            conn.execute(seed, {"user_id": user_id, "start": start, "stop": stop, "templates": TEMPLATE_COUNT})
+            conn.commit()
+            print(f"seeded {stop}/{count} posts ({time.perf_counter() - started:.0f}s)", file=sys.stderr)
+        conn.execute(text("ANALYZE posts"))
+        conn.commit()
+    return user_id
+
+
+def remove_seeded_posts(user_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(Post).where(Post.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+
+
+def measure(q: str, page_size: int, repeat: int) -> Tuple[List[float], List[float], int]:
+    """First-page and next-page latencies in ms, and the number of rows on the first page."""
+    first, following = [], []
+    rows = 0
+    for _ in range(repeat):
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            posts, cursor = search_posts(db, q, page_size)
+            first.append((time.perf_counter() - started) * 1000)
+            rows = len(posts)
+            if cursor:
+                started = time.perf_counter()
+                search_posts(db, q, page_size, cursor)
+                following.append((time.perf_counter() - started) * 1000)
+    return first, following, rows
+
+
+def _summary(timings: List[float]) -> str:
+    if not timings:
+        return f"{'-':>8s} {'-':>8s}"
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f"{statistics.median(timings):6.1f}ms {p95:6.1f}ms"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0, help="synthetic posts to insert first")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded posts")
+    parser.add_argument("--query", action="append", help="search text (repeatable)")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    user_id = seed_posts(args.seed) if args.seed else None
+    try:
+        with SessionLocal() as db:
+            total = db.query(Post).filter(Post.public == True).count()
+        print(f"{total} public posts, page size {args.page_size}, {args.repeat} runs per query")
+        print(f"{'query':14s} {'rows':>4s} {'first p50':>9s} {'p95':>8s} {'next p50':>9s} {'p95':>8s}")
+        for q in args.query or DEFAULT_QUERIES:
+            first, following, rows = measure(q, args.page_size, args.repeat)
+            print(f"{q:14s} {rows:4d} {_summary(first)}  {_summary(following)}")
+    finally:
+        if user_id is not None and not args.keep:
+            remove_seeded_posts(user_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
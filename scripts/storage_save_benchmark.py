@@ -0,0 +1,140 @@
+"""
+Throughput benchmark for LocalStorage writes.
+
+Writes --files files of --size-kib each with:
+
+- sequential: LocalStorage.save in a loop, the baseline
+- save_many: BaseStorage.save_many on the shared upload pool (UPLOAD_CONCURRENCY threads)
+- asave: asyncio.gather over BaseStorage.asave, the way async handlers store files
+- blocking: save called directly from a coroutine, for comparison with asave
+
+For the async modes it also reports the worst event-loop lag seen by a 1 ms
+ticker running next to the uploads, which shows whether other requests would
+stall. Each mode runs for every --fsync setting, in a temporary directory that is
+removed afterwards:
+
+    python -m scripts.storage_save_benchmark --files 64 --size-kib 512 --fsync none --fsync file --fsync full
+"""
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from storage import local
+from storage.base import UPLOAD_CONCURRENCY
+from storage.local import LocalStorage
+
+FOLDER = "bench"
+
+
+def _files(count: int, size: int) -> List[Tuple[UploadFile, str]]:
+    payload = os.urandom(size)
+    return [(UploadFile(file=io.BytesIO(payload), filename=f"{i}.bin"), f"{i}.bin") for i in range(count)]
+
+
+def _sequential(storage: LocalStorage, files) -> None:
+    for file, filename in files:
+        storage.save(file, filename, FOLDER)
+
+
+def _save_many(storage: LocalStorage, files) -> None:
+    storage.save_many(files, folder=FOLDER)
+
+
+async def _with_lag_probe(work) -> float:
+    """Runs work() and returns the worst lateness in ms of a 1 ms ticker running alongside it."""
+    worst = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal worst
+        while not done:
+            expected = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            worst = max(worst, (time.perf_counter() - expected) * 1000)
+
+    probe = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        await work()
+    finally:
+        done = True
+        await probe
+    return worst
+
+
+def _asave(storage: LocalStorage, files) -> float:
+    async def work():
+        await asyncio.gather(*(storage.asave(file, filename, FOLDER) for file, filename in files))
+    return asyncio.run(_with_lag_probe(work))
+
+
+def _blocking(storage: LocalStorage, files) -> float:
+    async def work():
+        for file, filename in files:
+            storage.save(file, filename, FOLDER)
+    return asyncio.run(_with_lag_probe(work))
+
+
+MODES: List[Tuple[str, Callable]] = [
+    ("sequential", _sequential),
+    ("save_many", _save_many),
+    ("asave", _asave),
+    ("blocking", _blocking),
+]
+
+
+def run(mode: Callable, files: int, size: int, repeat: int) -> Tuple[float, Optional[float]]:
+    """Median wall time in ms and, for async modes, the median worst loop lag in ms."""
+    storage = LocalStorage()
+    timings, lags = [], []
+    for _ in range(repeat):
+        batch = _files(files, size)
+        started = time.perf_counter()
+        lag = mode(storage, batch)
+        timings.append((time.perf_counter() - started) * 1000)
+        if lag is not None:
+            lags.append(lag)
+        shutil.rmtree(os.path.join(local.UPLOAD_DIR, FOLDER))
+    return statistics.median(timings), statistics.median(lags) if lags else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=64)
+    parser.add_argument("--size-kib", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fsync", action="append", choices=["none", "file", "full"], help="LOCAL_STORAGE_FSYNC values to try (repeatable)")
+    args = parser.parse_args(argv)
+
+    size = args.size_kib * 1024
+    workdir = tempfile.mkdtemp(prefix="storage-bench-")
+    cwd = os.getcwd()
+    # LocalStorage writes relative to the working directory (UPLOAD_DIR).
+    os.chdir(workdir)
+    try:
+        print(f"{args.files} files x {args.size_kib} KiB, {UPLOAD_CONCURRENCY} upload threads, median of {args.repeat} runs")
+        print(f"{'fsync':6s} {'mode':12s} {'total':>10s} {'MB/s':>8s} {'loop lag':>10s}")
+        for fsync in args.fsync or [local.LOCAL_STORAGE_FSYNC]:
+            local.LOCAL_STORAGE_FSYNC = fsync
+            for name, mode in MODES:
+                total_ms, lag_ms = run(mode, args.files, size, args.repeat)
+                throughput = args.files * size / (total_ms / 1000) / 1_000_000
+                lag = f"{lag_ms:8.1f}ms" if lag_ms is not None else f"{'-':>10s}"
+                print(f"{fsync:6s} {name:12s} {total_ms:8.1f}ms {throughput:8.0f} {lag}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Benchmark and header check for /uploads served by UploadStaticFiles.
+
+For a content-addressed file (<sha256>.<ext>) and a plain file it times:
+
+- full: a plain GET, expecting 200 with the ETag and Cache-Control of its kind
+- revalidate: GET with If-None-Match set to that ETag, expecting 304 and no body
+- range: the first 64 KiB (bytes=0-65535), expecting 206
+- suffix: the last 1 KiB (bytes=-1024), expecting 206
+
+Ranges are shortened to the file size for smaller files.
+
+It reports the median latency, requests/s and response bytes for each case, and
+exits with status 1 if a status code or cache header is wrong. By default it
+mounts UploadStaticFiles over a temporary directory in-process. With --base-url
+it requests files that already exist on a running server instead:
+
+    python -m scripts.upload_static_benchmark --size-kib 512 --requests 300
+    python -m scripts.upload_static_benchmark --base-url http://localhost:8000 \\
+        --path /uploads/board/<sha256>.jpg --path /uploads/board/<uuid>.jpg
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+import httpx
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from storage.base import DEFAULT_CACHE_CONTROL, IMMUTABLE_CACHE_CONTROL, content_hash_of
+from storage.local import UploadStaticFiles
+
+RANGE_BYTES = 64 * 1024
+SUFFIX_BYTES = 1024
+
+
+def _local_files(directory: str, size: int) -> List[str]:
+    payload = os.urandom(size)
+    addressed = f"{hashlib.sha256(payload).hexdigest()}.jpg"
+    for name in (addressed, "plain.jpg"):
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(payload)
+    return [f"/uploads/{addressed}", "/uploads/plain.jpg"]
+
+
+def _cases(client, path: str) -> List[Tuple[str, dict, int]]:
+    """(name, request headers, expected status) for path; ETag and size come from a first GET."""
+    first = client.get(path)
+    etag, size = first.headers.get("etag", ""), len(first.content)
+    return [
+        ("full", {}, 200),
+        ("revalidate", {"if-none-match": etag}, 304),
+        ("range", {"range": f"bytes=0-{min(RANGE_BYTES, size) - 1}"}, 206),
+        ("suffix", {"range": f"bytes=-{min(SUFFIX_BYTES, size)}"}, 206),
+    ]
+
+
+def check_headers(path: str, name: str, response: httpx.Response) -> List[str]:
+    problems = []
+    content_hash = content_hash_of(path)
+    expected_cache_control = IMMUTABLE_CACHE_CONTROL if content_hash else DEFAULT_CACHE_CONTROL
+    if response.headers.get("cache-control") != expected_cache_control:
+        problems.append(f"{path} {name}: cache-control {response.headers.get('cache-control')!r}")
+    if content_hash and response.headers.get("etag") != f'"{content_hash}"':
+        problems.append(f"{path} {name}: etag {response.headers.get('etag')!r} is not the content hash")
+    if name == "revalidate" and response.content:
+        problems.append(f"{path} {name}: 304 carried a body")
+    return problems
+
+
+def measure(client, path: str, requests: int) -> Tuple[List[tuple], List[str]]:
+    results, problems = [], []
+    for name, headers, expected_status in _cases(client, path):
+        timings = []
+        response = None
+        started_all = time.perf_counter()
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(path, headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+        elapsed = time.perf_counter() - started_all
+        if response.status_code != expected_status:
+            problems.append(f"{path} {name}: status {response.status_code}, expected {expected_status}")
+        problems.extend(check_headers(path, name, response))
+        results.append((name, response.status_code, len(response.content), statistics.median(timings), requests / elapsed))
+    return results, problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", help="running server to benchmark instead of an in-process mount")
+    parser.add_argument("--path", action="append", help="file URL path on --base-url (repeatable)")
+    parser.add_argument("--size-kib", type=int, default=512, help="size of the in-process test files")
+    parser.add_argument("--requests", type=int, default=300, help="requests per case")
+    args = parser.parse_args(argv)
+    if args.base_url and not args.path:
+        parser.error("--path is required with --base-url")
+
+    workdir = None
+    if args.base_url:
+        client, paths = httpx.Client(base_url=args.base_url, timeout=30), args.path
+    else:
+        workdir = tempfile.mkdtemp(prefix="upload-static-bench-")
+        paths = _local_files(workdir, args.size_kib * 1024)
+        app = Starlette()
+        app.mount("/uploads", UploadStaticFiles(directory=workdir), name="uploads")
+        client = TestClient(app)
+
+    problems = []
+    try:
+        with client:
+            print(f"{args.requests} requests per case")
+            print(f"{'file':10s} {'case':11s} {'status':>6s} {'bytes':>8s} {'median':>9s} {'req/s':>7s}")
+            for path in paths:
+                kind = "addressed" if content_hash_of(path) else "plain"
+                results, path_problems = measure(client, path, args.requests)
+                problems.extend(path_problems)
+                for name, status_code, size, median_ms, rate in results:
+                    print(f"{kind:10s} {name:11s} {status_code:6d} {size:8d} {median_ms:7.2f}ms {rate:7.0f}")
+    finally:
+        if workdir:
+            shutil.rmtree(workdir)
+
+    for problem in problems:
+        print(f"FAIL {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
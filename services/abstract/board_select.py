@@ -1,11 +1,94 @@
 from abc import abstractmethod
+from collections import defaultdict
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
-from schemas.community import PostResponse
+from models import Post, Report, Route, Image
+from schemas.base import SEOUL_TZ
+from schemas.community import PostListItem
+
+# One row per post: the post, its report's headline stats and its route's name/thumbnail, never Route.points_json.
+FEED_POST_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.content,
+    Post.like_count,
+    Post.read_count,
+    Post.comment_count,
+    Post.user_id,
+    Post.report_id,
+    Post.created_at,
+    Post.hash_tag,
+    Post.public,
+    Post.map_image_url,
+    Report.health_time,
+    Report.distance.label("report_distance"),
+    Report.average_speed,
+    Route.id.label("route_id"),
+    Route.name.label("route_name"),
+    Route.thumbnail_polyline,
+)
+
+
+def feed_post_query(db: Session, *extra_columns):
+    """Query for list endpoints selecting FEED_POST_COLUMNS (plus extra_columns) as plain tuples."""
+    return (
+        db.query(*FEED_POST_COLUMNS, *extra_columns)
+        .select_from(Post)
+        .outerjoin(Report, Post.report_id == Report.id)
+        .outerjoin(Route, Report.route_id == Route.id)
+    )
+
+
+def _format_duration(total_seconds: Optional[int]) -> Optional[str]:
+    if total_seconds is None:
+        return None
+    hours, rest = divmod(total_seconds, 3600)
+    return f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+
+def post_list_items(db: Session, rows) -> List[PostListItem]:
+    """Turn feed_post_query rows into response items, loading all their images with one query."""
+    images = defaultdict(list)
+    if rows:
+        image_rows = (
+            db.query(Image.post_id, Image.id, Image.url)
+            .filter(Image.post_id.in_([row.id for row in rows]))
+            .order_by(Image.id)
+        )
+        for post_id, image_id, url in image_rows:
+            images[post_id].append({"id": image_id, "url": url})
+
+    return [
+        {
+            "id": row.id,
+            "title": row.title,
+            "content": row.content,
+            "like_count": row.like_count,
+            "read_count": row.read_count,
+            "comment_count": row.comment_count,
+            "user_id": row.user_id,
+            "report_id": row.report_id,
+            "route_id": row.route_id,
+            "created_at": row.created_at.astimezone(SEOUL_TZ),
+            "images": images.get(row.id, []),
+            "hash_tag": row.hash_tag or [],
+            "public": row.public,
+            "map_image_url": row.map_image_url,
+            "route_name": row.route_name,
+            "is_liked": None,
+            "is_bookmarked": None,
+            "speed": row.average_speed,
+            "distance": row.report_distance,
+            "time": _format_duration(row.health_time),
+            "route_thumbnail": row.thumbnail_polyline,
+        }
+        for row in rows
+    ]
+
 
 class BoardSelectService:
     @abstractmethod
-    def select(self, db: Session, user_lat: Optional[float] = None, user_lon: Optional[float] = None, page: int = 1, page_size: int = 10) -> List[PostResponse]:
-        pass
\ No newline at end of file
+    def select(self, db: Session, user_lat: Optional[float] = None, user_lon: Optional[float] = None, page: int = 1, page_size: int = 10, cursor: Optional[str] = None) -> List[PostListItem]:
+        pass
@@ -1,54 +1,169 @@
 from fastapi import HTTPException, UploadFile
-from sqlalchemy.orm import Session, selectinload, aliased
-from typing import List, Optional
+from sqlalchemy.orm import Session, selectinload, joinedload, aliased
+from typing import List, Optional, Tuple
 import uuid
 import json
 from pydantic import ValidationError
-from sqlalchemy import func
+from sqlalchemy import func, exists, update, delete, select, literal, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from starlette import status
 
 from models import Post, Comment, User, Image, Report
-from schemas.community import PostCreate, PostUpdate, PostResponse, CommentCreate, CommentUpdate, Comment as CommentSchema, PostSearchResponse, PostCreateResponse
-from storage.base import BaseStorage
+from models.community import post_likes, comment_likes, bookmarked_posts
+from schemas.community import PostCreate, PostUpdate, PostResponse, CommentCreate, CommentUpdate, Comment as CommentSchema, PostListItem, PostCreateResponse
+from schemas.community import ViewerStateRequest, ViewerStateResponse, PostViewerState, CommentViewerState, CommentThreadResponse
+from storage.base import BaseStorage, FileTooLargeError
 from utill.comment import get_replies, process_mentions_and_notifications
+from utill.cursor import apply_keyset, next_cursor
+from utill.serialization import list_adapter
+from services.feed_cache import feed_cache, FEED_CACHE_MAX_PAGE
+from services.read_counter import read_count_buffer
+from services.push import push_dispatcher
+from services.like_counter import record_post_like_delta
+from services.storage_cleanup import enqueue_storage_deletion, discard_uploaded_files, storage_cleanup_worker
+from services.upload import resolve_uploaded_keys, save_uploaded_files
+from services.tag_trends import adjust_tag_trends, normalize_tags, post_weight
+from services.hot_posts import adjust_hot_scores, HOT_POST_WEIGHT, HOT_COMMENT_WEIGHT
+from services.abstract.board_select import feed_post_query, post_list_items
+from services.impl.board_default_select import DefaultBoardSelectService
+
+COMMENT_THREAD_REPLIES_PER_COMMENT = 20
+COMMENT_THREAD_MAX_DEPTH = 10
+
+
+
+def get_cached_feed_page(
+    db: Session, page: int, page_size: int
+) -> Optional[Tuple[List[PostListItem], bytes, Optional[str]]]:
+    """Public feed page as (items, serialized items, next cursor), served from the feed cache for the first pages.
+
+    The cached items are shared between requests; copy them before changing anything.
+    """
+    if page > FEED_CACHE_MAX_PAGE:
+        return None
+
+    def load() -> Tuple[List[PostListItem], bytes, Optional[str]]:
+        posts, next_page_cursor = DefaultBoardSelectService().select_page(db, page=page, page_size=page_size)
+        return posts, list_adapter(PostListItem).dump_json(posts), next_page_cursor
+
+    return feed_cache.get_or_load((page, page_size), load)
+
+
+def _linked_ids(db: Session, table, object_column: str, user_id: int, object_ids) -> set:
+    """IDs among object_ids that user_id has a row for in the association table, in one query."""
+    if not object_ids:
+        return set()
+    column = table.c[object_column]
+    rows = db.query(column).filter(table.c.user_id == user_id, column.in_(set(object_ids))).all()
+    return {row[0] for row in rows}
+
+
+def apply_viewer_state(db: Session, current_user: User, posts: List[PostListItem]) -> List[PostListItem]:
+    """Page of posts with is_liked / is_bookmarked filled in, using two set queries.
+
+    Returns copies, so items shared through a cache are left untouched.
+    """
+    post_ids = [post["id"] for post in posts]
+    liked = _linked_ids(db, post_likes, "post_id", current_user.id, post_ids)
+    bookmarked = _linked_ids(db, bookmarked_posts, "post_id", current_user.id, post_ids)
+    return [
+        {**post, "is_liked": post["id"] in liked, "is_bookmarked": post["id"] in bookmarked}
+        for post in posts
+    ]
+
+
+def get_viewer_state(request: ViewerStateRequest, db: Session, current_user: User) -> ViewerStateResponse:
+    liked_posts = _linked_ids(db, post_likes, "post_id", current_user.id, request.post_ids)
+    bookmarked = _linked_ids(db, bookmarked_posts, "post_id", current_user.id, request.post_ids)
+    liked_comments = _linked_ids(db, comment_likes, "comment_id", current_user.id, request.comment_ids)
+
+    return ViewerStateResponse(
+        posts=[
+            PostViewerState(id=post_id, is_liked=post_id in liked_posts, is_bookmarked=post_id in bookmarked)
+            for post_id in dict.fromkeys(request.post_ids)
+        ],
+        comments=[
+            CommentViewerState(id=comment_id, is_liked=comment_id in liked_comments)
+            for comment_id in dict.fromkeys(request.comment_ids)
+        ],
+    )
+
+
+def get_feed_cache_stats(current_user: User) -> dict:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view cache stats")
+    return feed_cache.stats()
 
 
+def get_storage_cleanup_stats(db: Session, current_user: User) -> dict:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view storage cleanup stats")
+    return storage_cleanup_worker.stats(db)
 
-def get_board(post_id: int, db: Session) -> PostResponse:
-    comment_count_subquery = db.query(
-        Comment.post_id,
-        func.count(Comment.id).label("comment_count")
-    ).filter(Comment.parent_id.is_(None)).group_by(Comment.post_id).subquery()
 
-    result = (
-        db.query(Post, func.coalesce(comment_count_subquery.c.comment_count, 0))
+def get_board(post_id: int, db: Session, current_user: Optional[User] = None) -> PostResponse:
+    post = (
+        db.query(Post)
         .options(
             selectinload(Post.images),
             selectinload(Post.report).selectinload(Report.route),
             selectinload(Post.author)
         )
-        .outerjoin(comment_count_subquery, Post.id == comment_count_subquery.c.post_id)
         .filter(Post.id == post_id)
         .first()
     )
 
-    if not result:
+    if not post:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
 
-    post, count = result
-    post_response = PostResponse.model_validate(post, update={'comment_count': count})
+    read_count_buffer.record(post.id, current_user.id if current_user else None)
+
+    post_response = PostResponse.model_validate(post)
     if post.report and post.report.route:
         post_response.route_name = post.report.route.name
     return post_response
 
 
+def _board_filename(upload: UploadFile, prefix: str = "") -> str:
+    file_extension = upload.filename.split(".")[-1]
+    return f"{prefix}{uuid.uuid4()}.{file_extension}"
+
+
+def _upload_board_images(
+    db: Session,
+    storage: BaseStorage,
+    map_image: Optional[UploadFile],
+    images: Optional[List[UploadFile]]
+) -> Tuple[Optional[str], List[str]]:
+    """Uploads the map image and the attached images concurrently. Returns (map_image_url, image_urls)."""
+    files = []
+    has_map_image = bool(map_image and map_image.filename)
+    if has_map_image:
+        files.append((map_image, _board_filename(map_image, "map_")))
+    for image in images or []:
+        if image.filename:
+            files.append((image, _board_filename(image)))
+
+    try:
+        urls = save_uploaded_files(db, storage, files, folder="board")
+    except FileTooLargeError:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="파일이 너무 큽니다.")
+    except Exception as e:
+        print(f"Error uploading board images: {e}")
+        raise HTTPException(status_code=500, detail="이미지 업로드에 실패했습니다.")
+
+    if has_map_image:
+        return urls[0], urls[1:]
+    return None, urls
+
+
 def create_board(
     db: Session,
     current_user: User,
     storage: BaseStorage,
     post_data: str,
     images: Optional[List[UploadFile]],
-    map_image: UploadFile
+    map_image: Optional[UploadFile]
 ) -> PostCreateResponse:
     try:
         post_data_dict = json.loads(post_data)
@@ -63,39 +178,45 @@ def create_board(
         if not report:
             raise HTTPException(status_code=404, detail="연결하려는 리포트를 찾을 수 없습니다.")
 
+    has_map_image = bool(map_image and map_image.filename)
+    if has_map_image == bool(post_create_schema.map_image_key):
+        raise HTTPException(status_code=422, detail="map_image 또는 map_image_key 중 하나만 보내야 합니다.")
+    map_image_key_urls = resolve_uploaded_keys(db, storage, [post_create_schema.map_image_key], "board", current_user) if post_create_schema.map_image_key else []
+    image_key_urls = resolve_uploaded_keys(db, storage, post_create_schema.image_keys, "board", current_user)
+
+    map_image_url, image_urls = _upload_board_images(db, storage, map_image, images)
+    uploaded_urls = ([map_image_url] if map_image_url else []) + image_urls
+    if map_image_key_urls:
+        map_image_url = map_image_key_urls[0]
+
     new_post = Post(
         title=post_create_schema.title,
         content=post_create_schema.content,
         report_id=post_create_schema.report_id,
         user_id=current_user.id,
-        hash_tag=post_create_schema.hash_tag,
+        hash_tag=normalize_tags(post_create_schema.hash_tag),
         public=post_create_schema.public,
         speed=post_create_schema.speed,
         distance=post_create_schema.distance,
         time=post_create_schema.time,
+        map_image_url=map_image_url,
+        images=[Image(url=image_url) for image_url in image_urls + image_key_urls],
     )
     db.add(new_post)
-    db.commit()
+    if new_post.public:
+        adjust_tag_trends(db, added=new_post.hash_tag)
+    try:
+        if new_post.public:
+            db.flush()
+            adjust_hot_scores(db, {new_post.id: HOT_POST_WEIGHT})
+        db.commit()
+    except Exception:
+        db.rollback()
+        discard_uploaded_files(uploaded_urls)
+        raise
     db.refresh(new_post)
 
-    if map_image and map_image.filename:
-        file_extension = map_image.filename.split(".")[-1]
-        filename = f"map_{uuid.uuid4()}.{file_extension}"
-        map_image_url = storage.save(file=map_image, filename=filename, folder="board")
-        new_post.map_image_url = map_image_url
-        db.add(new_post)
-        db.commit()
-        db.refresh(new_post)
-
-    if images:
-        for image in images:
-            file_extension = image.filename.split(".")[-1]
-            filename = f"{uuid.uuid4()}.{file_extension}"
-            image_url = storage.save(file=image, filename=filename, folder="board")
-            new_image = Image(url=image_url, post_id=new_post.id)
-            db.add(new_image)
-        db.commit()
-        db.refresh(new_post)
+    feed_cache.invalidate()
 
     post_response = PostCreateResponse.model_validate(new_post)
     if new_post.report and new_post.report.route:
@@ -126,41 +247,47 @@ def update_board(
     if post.user_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="수정 권한이 없습니다.")
 
-    for key, value in post_update_data.dict(exclude_unset=True).items():
-        setattr(post, key, value)
+    if map_image is not None and map_image.filename and post_update_data.map_image_key:
+        raise HTTPException(status_code=422, detail="map_image 또는 map_image_key 중 하나만 보내야 합니다.")
+    map_image_key_urls = resolve_uploaded_keys(db, storage, [post_update_data.map_image_key], "board", current_user) if post_update_data.map_image_key else []
+    image_key_urls = resolve_uploaded_keys(db, storage, post_update_data.new_image_keys, "board", current_user)
 
-    if map_image is not None:
-        if map_image.filename:
-            if post.map_image_url:
-                storage.delete(post.map_image_url)
-            file_extension = map_image.filename.split(".")[-1]
-            filename = f"map_{uuid.uuid4()}.{file_extension}"
-            map_image_url = storage.save(file=map_image, filename=filename, folder="board")
-            post.map_image_url = map_image_url
-        else:
-            if post.map_image_url:
-                storage.delete(post.map_image_url)
-            post.map_image_url = None
+    old_hash_tag = post.hash_tag
+    for key, value in post_update_data.dict(exclude_unset=True, exclude={"map_image_key", "new_image_keys"}).items():
+        setattr(post, key, value)
+    if post_update_data.hash_tag is not None:
+        post.hash_tag = normalize_tags(post_update_data.hash_tag)
+    if post.public and "hash_tag" in post_update_data.model_fields_set:
+        adjust_tag_trends(db, added=post.hash_tag, removed=old_hash_tag, removed_weight=post_weight(post))
+
+    new_map_image_url, new_image_urls = _upload_board_images(db, storage, map_image, new_images)
+    uploaded_urls = ([new_map_image_url] if new_map_image_url else []) + new_image_urls
+    urls_to_delete = []
+
+    if map_image_key_urls:
+        new_map_image_url = map_image_key_urls[0]
+    if map_image is not None or map_image_key_urls:
+        if post.map_image_url:
+            urls_to_delete.append(post.map_image_url)
+        post.map_image_url = new_map_image_url
 
-    current_images = {img.id: img for img in post.images}
     ids_to_keep = set(post_update_data.images_to_keep_ids) if post_update_data.images_to_keep_ids else set()
 
-    for img_id, img_obj in current_images.items():
-        if img_id not in ids_to_keep:
-            storage.delete(img_obj.url)
-            db.delete(img_obj)
-
-    if new_images:
-        for image_file in new_images:
-            if image_file.filename:
-                file_extension = image_file.filename.split(".")[-1]
-                filename = f"{uuid.uuid4()}.{file_extension}"
-                image_url = storage.save(file=image_file, filename=filename, folder="board")
-                new_image = Image(url=image_url, post_id=post.id)
-                db.add(new_image)
-                post.images.append(new_image)
+    # Image 파일은 before_delete 리스너가 정리 큐에 등록한다.
+    for img_obj in list(post.images):
+        if img_obj.id not in ids_to_keep:
+            post.images.remove(img_obj)
 
-    db.commit()
+    post.images.extend(Image(url=image_url) for image_url in new_image_urls + image_key_urls)
+    enqueue_storage_deletion(db, urls_to_delete)
+
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        discard_uploaded_files(uploaded_urls)
+        raise
+    feed_cache.invalidate()
     db.refresh(post)
     post_response = PostResponse.model_validate(post)
     if post.report and post.report.route:
@@ -174,43 +301,76 @@ def delete_board(post_id: int, db: Session, current_user: User, storage: BaseSto
     if post.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="삭제 권한이 없습니다.")
 
-    for image in post.images:
-        storage.delete(image.url)
-
-    if post.map_image_url:
-        storage.delete(post.map_image_url)
-
+    if post.public:
+        adjust_tag_trends(db, removed=post.hash_tag, removed_weight=post_weight(post))
+    # Image와 지도 이미지 파일은 before_delete 리스너가 정리 큐에 등록한다.
     db.delete(post)
     db.commit()
+    feed_cache.invalidate()
     return {"message": "글 삭제 성공"}
 
-def toggle_post_like(post_id: int, db: Session, current_user: User) -> dict:
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-
-    if current_user in post.liked_by_users:
-        post.liked_by_users.remove(current_user)
-        post.like_count -= 1
-        action = "unliked"
+def _ensure_exists(db: Session, id_column, object_id: int, detail: str):
+    if db.query(id_column).filter(id_column == object_id).first() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+def _has_link(db: Session, table, **keys) -> bool:
+    """Membership test against an association table without loading the ORM collection."""
+    conditions = [table.c[column] == value for column, value in keys.items()]
+    return db.query(exists().where(*conditions)).scalar()
+
+def _add_link(db: Session, table, **keys) -> bool:
+    """INSERT ... ON CONFLICT DO NOTHING. Returns True when a row was inserted."""
+    return db.execute(pg_insert(table).values(**keys).on_conflict_do_nothing()).rowcount > 0
+
+def _remove_link(db: Session, table, **keys) -> bool:
+    """Returns True when a row was deleted."""
+    conditions = [table.c[column] == value for column, value in keys.items()]
+    return db.execute(delete(table).where(*conditions)).rowcount > 0
+
+def _bump_like_count(db: Session, model, object_id: int, delta: int) -> int:
+    return db.execute(
+        update(model)
+        .where(model.id == object_id)
+        .values(like_count=func.coalesce(model.like_count, 0) + delta)
+        .returning(model.like_count)
+    ).scalar_one()
+
+def _toggle_like(db: Session, table, object_column: str, object_id: int, user_id: int, count_like) -> dict:
+    keys = {"user_id": user_id, object_column: object_id}
+    if _remove_link(db, table, **keys):
+        action, delta = "unliked", -1
+    elif _add_link(db, table, **keys):
+        action, delta = "liked", 1
     else:
-        post.liked_by_users.append(current_user)
-        post.like_count += 1
-        action = "liked"
+        # A concurrent request inserted the same like between our DELETE and INSERT.
+        action, delta = "liked", 0
 
+    like_count = count_like(db, object_id, delta)
     db.commit()
-    db.refresh(post)
+    return {"status": action, "like_count": like_count}
 
-    return {"status": action, "like_count": post.like_count}
+def toggle_post_like(post_id: int, db: Session, current_user: User) -> dict:
+    _ensure_exists(db, Post.id, post_id, "Post not found")
+
+    return _toggle_like(db, post_likes, "post_id", post_id, current_user.id, record_post_like_delta)
 
 def check_post_liked_status(post_id: int, db: Session, current_user: User) -> dict:
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    _ensure_exists(db, Post.id, post_id, "Post not found")
 
-    is_liked = current_user in post.liked_by_users
+    is_liked = _has_link(db, post_likes, user_id=current_user.id, post_id=post_id)
     return {"is_liked": is_liked}
 
+def _adjust_comment_counters(db: Session, post_id: Optional[int], parent_id: Optional[int], delta: int):
+    """Atomically bump the post's top-level comment count or the parent's reply count."""
+    if parent_id:
+        db.query(Comment).filter(Comment.id == parent_id).update(
+            {Comment.reply_count: Comment.reply_count + delta}, synchronize_session=False
+        )
+    elif post_id:
+        db.query(Post).filter(Post.id == post_id).update(
+            {Post.comment_count: Post.comment_count + delta}, synchronize_session=False
+        )
+
 def create_comment(post_id: int, comment: CommentCreate, db: Session, current_user: User) -> CommentSchema:
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
@@ -230,10 +390,11 @@ def create_comment(post_id: int, comment: CommentCreate, db: Session, current_us
         parent_id=comment.parent_id
     )
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    _adjust_comment_counters(db, post_id, comment.parent_id, 1)
+    adjust_hot_scores(db, {post_id: HOT_COMMENT_WEIGHT})
+    db.flush()
 
-    process_mentions_and_notifications(
+    pushes = process_mentions_and_notifications(
         db=db,
         mentions=comment.mentions,
         new_comment=new_comment,
@@ -241,28 +402,23 @@ def create_comment(post_id: int, comment: CommentCreate, db: Session, current_us
     )
 
     db.commit()
+    feed_cache.invalidate()
+    push_dispatcher.enqueue(pushes)
     db.refresh(new_comment)
     return new_comment
 
 def get_all_comment(post_id: int, db: Session) -> list[CommentSchema]:
-    ChildComment = aliased(Comment)
-
-    comments_with_count = (
-        db.query(
-            Comment,
-            func.count(ChildComment.id).label("comment_count")
-        )
-        .outerjoin(ChildComment, ChildComment.parent_id == Comment.id)
+    comments = (
+        db.query(Comment)
         .filter(Comment.post_id == post_id, Comment.parent_id.is_(None))
-        .group_by(Comment.id)
         .all()
     )
 
-    if not comments_with_count:
+    if not comments:
         raise HTTPException(status_code=404, detail="댓글을 찾을 수 없습니다.")
 
     result = []
-    for comment, count in comments_with_count:
+    for comment in comments:
         result.append(
             CommentSchema(
                 id=comment.id,
@@ -270,7 +426,7 @@ def get_all_comment(post_id: int, db: Session) -> list[CommentSchema]:
                 user_id=comment.user_id,
                 post_id=comment.post_id,
                 like_count=comment.like_count if hasattr(comment, "like_count") else 0,
-                comment_count=count
+                comment_count=comment.reply_count
             )
         )
 
@@ -283,17 +439,16 @@ def update_comment(comment_id: int, comment_update: CommentUpdate, db: Session,
     if comment.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="수정 권한이 없습니다.")
     comment.content = comment_update.content
-    db.commit()
-    db.refresh(comment)
 
-    process_mentions_and_notifications(
+    pushes = process_mentions_and_notifications(
         db=db,
-        mentions=comment.mentions,
+        mentions=comment_update.mentions,
         new_comment=comment,
         current_user=current_user
     )
 
     db.commit()
+    push_dispatcher.enqueue(pushes)
     db.refresh(comment)
     return comment
 
@@ -303,8 +458,12 @@ def delete_comment(comment_id: int, db: Session, current_user: User):
         raise HTTPException(status_code=404, detail="댓글을 찾을 수 없습니다.")
     if comment.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="삭제 권한이 없습니다.")
+    _adjust_comment_counters(db, comment.post_id, comment.parent_id, -1)
+    if comment.post_id:
+        adjust_hot_scores(db, {comment.post_id: -HOT_COMMENT_WEIGHT})
     db.delete(comment)
     db.commit()
+    feed_cache.invalidate()
     return {"message": "댓글 삭제 성공"}
 
 def read_replies(comment_id: int, db: Session):
@@ -314,159 +473,147 @@ def read_replies(comment_id: int, db: Session):
 
     return get_replies(db, comment_id)
 
-def toggle_comment_like(comment_id: int, db: Session, current_user: User) -> dict:
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
+def get_comment_thread(
+    post_id: int,
+    db: Session,
+    page_size: int,
+    cursor: Optional[str] = None,
+    replies_per_comment: int = COMMENT_THREAD_REPLIES_PER_COMMENT,
+    max_depth: int = COMMENT_THREAD_MAX_DEPTH,
+) -> Tuple[List[CommentThreadResponse], Optional[str]]:
+    """A page of top-level comments with their reply trees, loaded with one recursive query.
+
+    Top-level comments are paged newest-first by (created_at, id). Each comment
+    carries at most replies_per_comment of its oldest replies, down to max_depth
+    levels; reply_count tells the client whether more can be loaded.
+    """
+    _ensure_exists(db, Post.id, post_id, "Post not found")
+
+    top_level = apply_keyset(
+        select(Comment.id).where(Comment.post_id == post_id, Comment.parent_id.is_(None)),
+        Comment.created_at, Comment.id, cursor,
+    ).limit(page_size).subquery()
+    thread = select(top_level.c.id, literal(0).label("depth")).cte("thread", recursive=True)
+
+    reply = aliased(Comment)
+    first_replies = (
+        select(reply.id)
+        .where(reply.parent_id == thread.c.id)
+        .order_by(reply.created_at, reply.id)
+        .limit(replies_per_comment)
+        .lateral()
+    )
+    thread = thread.union_all(
+        select(first_replies.c.id, thread.c.depth + 1)
+        .select_from(thread.join(first_replies, true()))
+        .where(thread.c.depth < max_depth)
+    )
 
-    if current_user in comment.liked_by_users:
-        comment.liked_by_users.remove(current_user)
-        comment.like_count -= 1
-        action = "unliked"
-    else:
-        comment.liked_by_users.append(current_user)
-        comment.like_count += 1
-        action = "liked"
+    rows = (
+        db.query(Comment, thread.c.depth)
+        .join(thread, Comment.id == thread.c.id)
+        .options(joinedload(Comment.author))
+        .order_by(thread.c.depth, Comment.created_at, Comment.id)
+        .all()
+    )
 
-    db.commit()
-    db.refresh(comment)
+    # Parents come before their replies (ordered by depth), so one pass builds the tree.
+    nodes = {}
+    top_level_nodes = []
+    for comment, depth in rows:
+        node = CommentThreadResponse.model_validate(comment)
+        nodes[comment.id] = node
+        if depth == 0:
+            top_level_nodes.append(node)
+        else:
+            nodes[comment.parent_id].replies.append(node)
+
+    top_level_nodes.sort(key=lambda node: (node.created_at, node.id), reverse=True)
+    return top_level_nodes, next_cursor(top_level_nodes, page_size)
+
+def toggle_comment_like(comment_id: int, db: Session, current_user: User) -> dict:
+    _ensure_exists(db, Comment.id, comment_id, "Comment not found")
 
-    return {"status": action, "like_count": comment.like_count}
+    return _toggle_like(
+        db, comment_likes, "comment_id", comment_id, current_user.id,
+        lambda db, comment_id, delta: _bump_like_count(db, Comment, comment_id, delta)
+    )
 
 def check_comment_liked_status(comment_id: int, db: Session, current_user: User) -> dict:
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
+    _ensure_exists(db, Comment.id, comment_id, "Comment not found")
 
-    is_liked = current_user in comment.liked_by_users
+    is_liked = _has_link(db, comment_likes, user_id=current_user.id, comment_id=comment_id)
     return {"is_liked": is_liked}
 
 def get_my_bookmarked_posts(
     current_user: User,
     db: Session,
     page: int,
-    page_size: int
-) -> List[PostSearchResponse]:
+    page_size: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[PostListItem], Optional[str]]:
     skip = (page - 1) * page_size
 
-    comment_count_subquery = db.query(
-        Comment.post_id,
-        func.count(Comment.id).label("comment_count")
-    ).filter(Comment.parent_id.is_(None)).group_by(Comment.post_id).subquery()
-
-    bookmarked_posts_with_comment_count = (db.query(Post, func.coalesce(comment_count_subquery.c.comment_count, 0))
-                                           .options(selectinload(Post.report), selectinload(Post.images))
-                                           .join(User.bookmarked_posts).filter(User.id == current_user.id)
-                                           .outerjoin(comment_count_subquery, Post.id == comment_count_subquery.c.post_id)
-                                           .order_by(Post.created_at.desc()).offset(skip).limit(page_size).all())
-
-    response = []
-    for post, count in bookmarked_posts_with_comment_count:
-        model = PostSearchResponse.model_validate(post)
-        model.comment_count = count
-        response.append(model)
+    query = (feed_post_query(db)
+             .join(bookmarked_posts, bookmarked_posts.c.post_id == Post.id)
+             .filter(bookmarked_posts.c.user_id == current_user.id))
+    query = apply_keyset(query, Post.created_at, Post.id, cursor)
+    if not cursor:
+        query = query.offset(skip)
+    rows = query.limit(page_size).all()
 
-    return response
+    return post_list_items(db, rows), next_cursor(rows, page_size)
 
 def get_my_posts(
     current_user: User,
     db: Session,
     page: int,
-    page_size: int
-) -> List[PostSearchResponse]:
+    page_size: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[PostListItem], Optional[str]]:
     skip = (page - 1) * page_size
 
-    comment_count_subquery = db.query(
-        Comment.post_id,
-        func.count(Comment.id).label("comment_count")
-    ).filter(Comment.parent_id.is_(None)).group_by(Comment.post_id).subquery()
-
-    my_posts_with_comment_count = (db.query(Post, func.coalesce(comment_count_subquery.c.comment_count, 0))
-                                   .options(selectinload(Post.report).selectinload(Report.route), selectinload(Post.images))
-                                   .filter(Post.user_id == current_user.id)
-                                   .outerjoin(comment_count_subquery, Post.id == comment_count_subquery.c.post_id)
-                                   .order_by(Post.created_at.desc()).offset(skip).limit(page_size).all())
-
-    response = []
-    for post, count in my_posts_with_comment_count:
-        model = PostSearchResponse.model_validate(post)
-        model.comment_count = count
-        if post.report and post.report.route:
-            model.route_id = post.report.route.id
-            model.route_name = post.report.route.name
-        response.append(model)
-
-    return response
-
-def get_my_recent_posts(current_user: User, db: Session) -> List[PostSearchResponse]:
-    comment_count_subquery = db.query(
-        Comment.post_id,
-        func.count(Comment.id).label("comment_count")
-    ).filter(Comment.parent_id.is_(None)).group_by(Comment.post_id).subquery()
-
-    my_posts_with_comment_count = (db.query(Post, func.coalesce(comment_count_subquery.c.comment_count, 0))
-                                   .options(selectinload(Post.report).selectinload(Report.route), selectinload(Post.images))
-                                   .filter(Post.user_id == current_user.id)
-                                   .outerjoin(comment_count_subquery, Post.id == comment_count_subquery.c.post_id)
-                                   .order_by(Post.created_at.desc()).limit(4).all())
-
-    response = []
-    for post, count in my_posts_with_comment_count:
-        model = PostSearchResponse.model_validate(post)
-        model.comment_count = count
-        if post.report and post.report.route:
-            model.route_id = post.report.route.id
-            model.route_name = post.report.route.name
-        response.append(model)
-
-    return response
-
-def get_my_recent_bookmarked_posts(current_user: User, db: Session) -> List[PostSearchResponse]:
-    comment_count_subquery = db.query(
-        Comment.post_id,
-        func.count(Comment.id).label("comment_count")
-    ).filter(Comment.parent_id.is_(None)).group_by(Comment.post_id).subquery()
-
-    bookmarked_posts_with_comment_count = (db.query(Post, func.coalesce(comment_count_subquery.c.comment_count, 0))
-                                           .options(selectinload(Post.report), selectinload(Post.images))
-                                           .join(User.bookmarked_posts).filter(User.id == current_user.id)
-                                           .outerjoin(comment_count_subquery, Post.id == comment_count_subquery.c.post_id)
-                                           .order_by(Post.created_at.desc()).limit(4).all())
-
-    response = []
-    for post, count in bookmarked_posts_with_comment_count:
-        model = PostSearchResponse.model_validate(post)
-        model.comment_count = count
-        response.append(model)
-
-    return response
+    query = feed_post_query(db).filter(Post.user_id == current_user.id)
+    query = apply_keyset(query, Post.created_at, Post.id, cursor)
+    if not cursor:
+        query = query.offset(skip)
+    rows = query.limit(page_size).all()
+
+    return post_list_items(db, rows), next_cursor(rows, page_size)
+
+def get_my_recent_posts(current_user: User, db: Session) -> List[PostListItem]:
+    rows = (feed_post_query(db)
+            .filter(Post.user_id == current_user.id)
+            .order_by(Post.created_at.desc()).limit(4).all())
+
+    return post_list_items(db, rows)
+
+def get_my_recent_bookmarked_posts(current_user: User, db: Session) -> List[PostListItem]:
+    rows = (feed_post_query(db)
+            .join(bookmarked_posts, bookmarked_posts.c.post_id == Post.id)
+            .filter(bookmarked_posts.c.user_id == current_user.id)
+            .order_by(Post.created_at.desc()).limit(4).all())
+
+    return post_list_items(db, rows)
 
 def bookmark_post(post_id: int, db: Session, current_user: User):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    
-    if post in current_user.bookmarked_posts:
+    _ensure_exists(db, Post.id, post_id, "Post not found")
+
+    if not _add_link(db, bookmarked_posts, user_id=current_user.id, post_id=post_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Post already bookmarked")
 
-    current_user.bookmarked_posts.append(post)
     db.commit()
 
 def unbookmark_post(post_id: int, db: Session, current_user: User):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    _ensure_exists(db, Post.id, post_id, "Post not found")
 
-    if post not in current_user.bookmarked_posts:
+    if not _remove_link(db, bookmarked_posts, user_id=current_user.id, post_id=post_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Post not bookmarked")
 
-    current_user.bookmarked_posts.remove(post)
     db.commit()
 
 def is_bookmarked(post_id: int, current_user: User, db: Session) -> dict:
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    _ensure_exists(db, Post.id, post_id, "Post not found")
 
-    is_bookmarked = post in current_user.bookmarked_posts
-    return {"is_bookmarked": is_bookmarked}
\ No newline at end of file
+    is_bookmarked = _has_link(db, bookmarked_posts, user_id=current_user.id, post_id=post_id)
+    return {"is_bookmarked": is_bookmarked}
@@ -0,0 +1,80 @@
+"""
+In-process cache for the first pages of the public community feed.
+
+Each gunicorn worker keeps its own cache, so writes handled by another worker
+only become visible once the short TTL expires. Writes handled by this worker
+invalidate immediately.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from cachetools import TTLCache
+
+FEED_CACHE_TTL_SECONDS = float(os.getenv("FEED_CACHE_TTL_SECONDS", "5"))
+FEED_CACHE_MAX_PAGE = int(os.getenv("FEED_CACHE_MAX_PAGE", "3"))
+
+
+class FeedCache:
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, running loader at most once per key on a miss."""
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                return self._cache[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent misses for the same key wait here instead of all hitting the database.
+        with key_lock:
+            try:
+                with self._lock:
+                    if key in self._cache:
+                        self.hits += 1
+                        return self._cache[key]
+                    self.misses += 1
+                    generation = self._generation
+
+                value = loader()
+
+                with self._lock:
+                    # Drop results computed from data that was invalidated while loading.
+                    if generation == self._generation:
+                        self._cache[key] = value
+                return value
+            finally:
+                # Waiters already hold this lock; later misses start a new one. Keeps
+                # _key_locks from growing with every key ever requested, failed loads included.
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._cache),
+                "loading": len(self._key_locks),
+                "ttl_seconds": self._cache.ttl,
+            }
+
+
+feed_cache = FeedCache(ttl=FEED_CACHE_TTL_SECONDS)
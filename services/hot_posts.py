@@ -0,0 +1,145 @@
+"""
+"Hot" post ranking.
+
+Every event adds a weight to its post's score: publishing a post
+HOT_POST_WEIGHT, a like HOT_LIKE_WEIGHT, a comment HOT_COMMENT_WEIGHT (unlikes
+and deleted comments subtract). Each weight halves every HOT_HALF_LIFE_HOURS.
+
+Instead of decaying stored scores, post_hot_scores.hot_rank stores
+log2(sum(weight * 2^level(event time))), where level(t) counts half-lives since
+HOT_EPOCH. All scores decay by the same factor, so ordering by hot_rank is
+ordering by the current score, and (hot_rank, post_id) is a plain keyset index.
+The current score is 2^(hot_rank - level(now)). Adding an event is a log-sum-exp
+on one row, so it is applied incrementally: comments and new posts in their own
+transaction, likes when like_counter folds its pending events.
+
+A background task prunes rows whose score has decayed to nothing, and the
+first /post/hot page is cached for HOT_CACHE_TTL_SECONDS.
+"""
+import math
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, case, cast, column, delete, func, or_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import PostHotScore
+from schemas.community import PostListItem
+from services.feed_cache import FeedCache
+from services.impl.board_hot_select import HotBoardSelectService
+from utill.periodic import PeriodicTask
+from utill.serialization import list_adapter
+
+# Stored ranks depend on these two; changing them means recomputing post_hot_scores.
+HOT_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HOT_HALF_LIFE_HOURS = 12.0
+
+HOT_POST_WEIGHT = 1.0
+HOT_LIKE_WEIGHT = 1.0
+HOT_COMMENT_WEIGHT = 2.0
+
+# Rows below 2^-HOT_PRUNE_HALF_LIVES of one like today are dropped.
+HOT_PRUNE_HALF_LIVES = 24
+HOT_PRUNE_SECONDS = float(os.getenv("HOT_PRUNE_SECONDS", "600"))
+HOT_CACHE_TTL_SECONDS = float(os.getenv("HOT_CACHE_TTL_SECONDS", "30"))
+
+_LN2 = math.log(2)
+# Postgres raises on float underflow in power(); below 2^-60 the term no longer matters anyway.
+_MIN_EXPONENT = -60
+
+hot_cache = FeedCache(ttl=HOT_CACHE_TTL_SECONDS)
+
+
+def _log2(value):
+    return func.ln(value) / _LN2
+
+
+def current_level():
+    """Half-lives elapsed between HOT_EPOCH and now(), as a SQL expression."""
+    elapsed = cast(func.extract("epoch", func.now()), Float) - HOT_EPOCH.timestamp()
+    return elapsed / (HOT_HALF_LIFE_HOURS * 3600)
+
+
+def _added(rank, x):
+    """log2(2^rank + 2^x) without overflow; rank may be NULL (no score yet)."""
+    return case(
+        (rank.is_(None), x),
+        else_=func.greatest(rank, x) + _log2(1 + func.power(2.0, func.greatest(-func.abs(rank - x), _MIN_EXPONENT))),
+    )
+
+
+def _subtracted(rank, x):
+    """log2(2^rank - 2^x), or NULL once nothing is left."""
+    return case(
+        (or_(rank.is_(None), x >= rank), None),
+        else_=rank + _log2(1 - func.power(2.0, func.greatest(x - rank, _MIN_EXPONENT))),
+    )
+
+
+def adjust_hot_scores(executor, deltas: Dict[int, float]) -> None:
+    """Apply weight deltas {post_id: weight} at the current time, in the caller's transaction.
+
+    executor is a Session or a Connection.
+    """
+    added = sorted((post_id, weight) for post_id, weight in deltas.items() if weight > 0)
+    removed = sorted((post_id, -weight) for post_id, weight in deltas.items() if weight < 0)
+
+    if added:
+        stmt = pg_insert(PostHotScore).values([
+            {"post_id": post_id, "hot_rank": current_level() + math.log2(weight)} for post_id, weight in added
+        ])
+        executor.execute(stmt.on_conflict_do_update(
+            index_elements=[PostHotScore.post_id],
+            set_={"hot_rank": _added(PostHotScore.hot_rank, stmt.excluded.hot_rank), "updated_at": func.now()},
+        ))
+
+    if removed:
+        weights = values(column("post_id", Integer), column("weight", Float), name="removed_weights").data(removed)
+        executor.execute(
+            update(PostHotScore)
+            .where(PostHotScore.post_id == weights.c.post_id)
+            .values(hot_rank=_subtracted(PostHotScore.hot_rank, current_level() + _log2(weights.c.weight)))
+        )
+
+
+def prune_hot_scores(db: Session) -> int:
+    """Delete rows whose score has decayed away. Returns the number of rows deleted."""
+    deleted = db.execute(
+        delete(PostHotScore).where(
+            or_(PostHotScore.hot_rank.is_(None), PostHotScore.hot_rank < current_level() - HOT_PRUNE_HALF_LIVES)
+        )
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def _prune_with_new_session() -> int:
+    db = SessionLocal()
+    try:
+        return prune_hot_scores(db)
+    finally:
+        db.close()
+
+
+def get_cached_hot_page(
+    db: Session, page_size: int, cursor: Optional[str]
+) -> Tuple[List[PostListItem], bytes, Optional[str]]:
+    """/post/hot page as (items, serialized items, next cursor).
+
+    Only the first page is cached, for HOT_CACHE_TTL_SECONDS. Cursors come from
+    the client, so keying the cache on them would let anyone fill it.
+    """
+
+    def load() -> Tuple[List[PostListItem], bytes, Optional[str]]:
+        posts, next_page_cursor = HotBoardSelectService().select_page(db, page_size=page_size, cursor=cursor)
+        return posts, list_adapter(PostListItem).dump_json(posts), next_page_cursor
+
+    if cursor is not None:
+        return load()
+    return hot_cache.get_or_load(page_size, load)
+
+
+hot_pruner = PeriodicTask("hot-posts-pruner", HOT_PRUNE_SECONDS, _prune_with_new_session)
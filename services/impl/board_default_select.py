@@ -1,52 +1,44 @@
-from sqlalchemy.orm import Session, selectinload
-from typing import List, Optional
-from sqlalchemy import func
+from sqlalchemy import cast
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
 
-from services.abstract.board_select import BoardSelectService
-from models import Post, Comment, Report, Route
-from schemas.community import PostSearchResponse
+from services.abstract.board_select import BoardSelectService, feed_post_query, post_list_items
+from models import Post
+from schemas.community import PostListItem
+from utill.cursor import apply_keyset, next_cursor
 
 
 class DefaultBoardSelectService(BoardSelectService):
-    def select(
+    def select_page(
         self,
         db: Session,
-        user_lat: Optional[float] = None,
-        user_lon: Optional[float] = None,
         page: int = 1,
         page_size: int = 10,
-    ) -> List[PostSearchResponse]:
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Tuple[List[PostListItem], Optional[str]]:
         skip = (page - 1) * page_size
 
-        comment_count_subquery = (
-            db.query(Comment.post_id, func.count(Comment.id).label("comment_count"))
-            .filter(Comment.parent_id.is_(None))
-            .group_by(Comment.post_id)
-            .subquery()
-        )
+        query = feed_post_query(db).filter(Post.public == True)
+        if tag:
+            # @> 연산자라서 ix_posts_hash_tag (GIN) 인덱스를 탄다
+            query = query.filter(Post.hash_tag.op("@>")(cast([tag], Post.hash_tag.type)))
+        query = apply_keyset(query, Post.created_at, Post.id, cursor)
+        if not cursor:
+            query = query.offset(skip)
+        rows = query.limit(page_size).all()
 
-        posts_with_comment_count = (
-            db.query(Post, func.coalesce(comment_count_subquery.c.comment_count, 0))
-            .options(
-                selectinload(Post.images),
-                selectinload(Post.report).selectinload(Report.route),
-                selectinload(Post.author),
-            )
-            .outerjoin(comment_count_subquery, Post.id == comment_count_subquery.c.post_id)
-            .filter(Post.public == True)
-            .order_by(Post.created_at.desc())
-            .offset(skip)
-            .limit(page_size)
-            .all()
-        )
+        return post_list_items(db, rows), next_cursor(rows, page_size)
 
-        response = []
-        for post, count in posts_with_comment_count:
-            model = PostSearchResponse.model_validate(post)
-            model.comment_count = count
-            if post.report and post.report.route:
-                model.route_name = post.report.route.name
-                model.route_id = post.report.route.id
-            response.append(model)
-
-        return response
+    def select(
+        self,
+        db: Session,
+        user_lat: Optional[float] = None,
+        user_lon: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> List[PostListItem]:
+        posts, _ = self.select_page(db, page=page, page_size=page_size, cursor=cursor, tag=tag)
+        return posts
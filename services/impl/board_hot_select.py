@@ -0,0 +1,42 @@
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+
+from services.abstract.board_select import BoardSelectService, feed_post_query, post_list_items
+from models import Post, PostHotScore
+from schemas.community import PostListItem
+from utill.cursor import encode_rank_cursor, decode_rank_cursor
+
+
+class HotBoardSelectService(BoardSelectService):
+    """Public posts ordered by post_hot_scores.hot_rank (see services/hot_posts.py)."""
+
+    def select_page(
+        self, db: Session, page_size: int = 10, cursor: Optional[str] = None
+    ) -> Tuple[List[PostListItem], Optional[str]]:
+        query = (
+            feed_post_query(db, PostHotScore.hot_rank)
+            .join(PostHotScore, PostHotScore.post_id == Post.id)
+            .filter(Post.public == True, PostHotScore.hot_rank.isnot(None))
+        )
+        if cursor:
+            hot_rank, post_id = decode_rank_cursor(cursor)
+            query = query.filter(tuple_(PostHotScore.hot_rank, PostHotScore.post_id) < tuple_(hot_rank, post_id))
+        rows = query.order_by(PostHotScore.hot_rank.desc(), PostHotScore.post_id.desc()).limit(page_size).all()
+
+        next_page_cursor = None
+        if len(rows) == page_size:
+            next_page_cursor = encode_rank_cursor(rows[-1].hot_rank, rows[-1].id)
+        return post_list_items(db, rows), next_page_cursor
+
+    def select(
+        self,
+        db: Session,
+        user_lat: Optional[float] = None,
+        user_lon: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+    ) -> List[PostListItem]:
+        posts, _ = self.select_page(db, page_size=page_size, cursor=cursor)
+        return posts
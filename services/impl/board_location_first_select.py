@@ -1,56 +1,71 @@
+from sqlalchemy import and_, or_, tuple_
 from sqlalchemy.orm import Session
-from typing import List
-import math
+from typing import List, Optional, Tuple
 
-from services.abstract.board_select import BoardSelectService
-from models import Post, Report, Route
-from schemas.community import PostResponse
+from services.abstract.board_select import BoardSelectService, feed_post_query, post_list_items
+from models import Post, Route
+from schemas.community import PostListItem
+from utill.cursor import encode_distance_cursor, decode_distance_cursor
+from utill.geo import bounding_box, sql_haversine_km
 
-
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371  # Radius of Earth in kilometers
-
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-
-    dlon = lon2_rad - lon1_rad
-    dlat = lat2_rad - lat1_rad
-
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-    distance = R * c
-    return distance
+DEFAULT_RADIUS_KM = 30.0
 
 
 class LocationBoardSelectService(BoardSelectService):
-    def select(self, db: Session, user_lat: float, user_lon: float) -> List[PostResponse]:
-        posts_with_location = (
-            db.query(Post, Route.start_point)
-            .join(Report, Post.report_id == Report.id)
-            .join(Route, Report.route_id == Route.id)
-            .filter(Route.start_point.isnot(None))
-            .all()
-        )
+    """Public posts whose route starts within radius_km, nearest first, then newest first."""
 
-        if not posts_with_location:
-            return []
+    def __init__(self, radius_km: float = DEFAULT_RADIUS_KM):
+        self.radius_km = radius_km
 
-        # Calculate distance for each post
-        posts_with_distance = []
-        for post, start_point in posts_with_location:
-            if start_point and 'latitude' in start_point and 'longitude' in start_point:
-                post_lat = start_point['latitude']
-                post_lon = start_point['longitude']
-                distance = haversine(user_lat, user_lon, post_lat, post_lon)
-                posts_with_distance.append((post, distance))
+    def select_page(
+        self,
+        db: Session,
+        user_lat: float,
+        user_lon: float,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[PostListItem], Optional[str]]:
+        min_lat, min_lon, max_lat, max_lon = bounding_box(user_lat, user_lon, self.radius_km)
+        distance = sql_haversine_km(Route.start_lat, Route.start_lon, user_lat, user_lon)
 
-        # Sort posts by distance
-        sorted_posts = sorted(posts_with_distance, key=lambda x: x[1])
+        query = (
+            # 아래 Route 조건 때문에 feed_post_query 의 outer join 은 사실상 inner join 이 된다
+            feed_post_query(db, distance.label("distance_km"))
+            .filter(
+                Post.public == True,
+                Route.start_lat.between(min_lat, max_lat),
+                Route.start_lon.between(min_lon, max_lon),
+                distance <= self.radius_km,
+            )
+        )
+        if cursor:
+            # 거리는 오름차순, (created_at, id) 는 내림차순이라 튜플 비교 하나로는 안 된다.
+            # 같은 좌표로 계산한 거리는 매번 같은 double 값이라 등호 비교가 성립한다.
+            last_distance, last_created_at, last_id = decode_distance_cursor(cursor)
+            query = query.filter(or_(
+                distance > last_distance,
+                and_(distance == last_distance, tuple_(Post.created_at, Post.id) < tuple_(last_created_at, last_id)),
+            ))
+        query = query.order_by(distance, Post.created_at.desc(), Post.id.desc())
+        if not cursor:
+            query = query.offset((page - 1) * page_size)
+        rows = query.limit(page_size).all()
 
-        # Prepare response
-        response = [PostResponse.model_validate(post) for post, distance in sorted_posts]
+        next_page_cursor = None
+        if len(rows) == page_size:
+            last = rows[-1]
+            next_page_cursor = encode_distance_cursor(last.distance_km, last.created_at, last.id)
+        return post_list_items(db, rows), next_page_cursor
 
-        return response
+    def select(
+        self,
+        db: Session,
+        user_lat: Optional[float] = None,
+        user_lon: Optional[float] = None,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+    ) -> List[PostListItem]:
+        posts, _ = self.select_page(db, user_lat, user_lon, page=page, page_size=page_size, cursor=cursor)
+        return posts
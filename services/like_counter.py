@@ -0,0 +1,80 @@
+"""
+Contention-free post like counting.
+
+Every like/unlike appends a +1/-1 row to post_like_events instead of updating
+the hot posts row, so concurrent likers on one post never wait on each other.
+A background thread folds pending events into posts.like_count every
+LIKE_FOLD_SECONDS. posts.like_count is therefore at most that stale, while
+current_post_like_count() adds the pending deltas and is always exact. The same
+fold feeds the folded deltas into the hot ranking (services/hot_posts.py), and
+invalidates the feed cache once it has changed a like_count. A like by itself
+changes nothing that a cached feed page shows.
+"""
+import os
+
+from sqlalchemy import text, func, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import Post, PostLikeEvent
+from services.feed_cache import feed_cache
+from services.hot_posts import adjust_hot_scores, HOT_LIKE_WEIGHT
+from utill.periodic import PeriodicTask
+
+LIKE_FOLD_SECONDS = float(os.getenv("LIKE_FOLD_SECONDS", "2"))
+
+# One statement: concurrent folds cannot double-apply an event because each
+# event row is deleted (and returned) exactly once.
+_FOLD_SQL = text("""
+    WITH moved AS (
+        DELETE FROM post_like_events
+        RETURNING post_id, delta
+    ), totals AS (
+        SELECT post_id, sum(delta) AS delta
+        FROM moved
+        GROUP BY post_id
+    )
+    UPDATE posts
+    SET like_count = coalesce(posts.like_count, 0) + totals.delta
+    FROM totals
+    WHERE posts.id = totals.post_id AND totals.delta <> 0
+    RETURNING posts.id, totals.delta
+""")
+
+
+def record_post_like_delta(db: Session, post_id: int, delta: int) -> int:
+    """Append a like delta in the caller's transaction and return the exact like count."""
+    if delta:
+        db.add(PostLikeEvent(post_id=post_id, delta=delta))
+        db.flush()
+    return current_post_like_count(db, post_id)
+
+
+def current_post_like_count(db: Session, post_id: int) -> int:
+    pending = (
+        select(func.coalesce(func.sum(PostLikeEvent.delta), 0))
+        .where(PostLikeEvent.post_id == post_id)
+        .scalar_subquery()
+    )
+    return db.query(func.coalesce(Post.like_count, 0) + pending).filter(Post.id == post_id).scalar() or 0
+
+
+def fold_post_like_events(db: Session) -> int:
+    """Fold all pending like events into posts.like_count and the hot ranking. Returns the number of posts updated."""
+    totals = db.execute(_FOLD_SQL).all()
+    adjust_hot_scores(db, {post_id: HOT_LIKE_WEIGHT * delta for post_id, delta in totals})
+    db.commit()
+    if totals:
+        feed_cache.invalidate()
+    return len(totals)
+
+
+def _fold_with_new_session() -> int:
+    db = SessionLocal()
+    try:
+        return fold_post_like_events(db)
+    finally:
+        db.close()
+
+
+like_folder = PeriodicTask("post-like-folder", LIKE_FOLD_SECONDS, _fold_with_new_session)
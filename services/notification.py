@@ -0,0 +1,74 @@
+"""
+Notification inbox.
+
+users.unread_notification_count is maintained on write: create_notifications
+adds to it in the same transaction as the inserted rows, mark_notifications_read
+subtracts the number of rows it actually flipped, and deleting an unread
+notification (e.g. with its comment) subtracts one in utils/events.py. The
+count is therefore read from the users row that authentication already loaded,
+without touching the notifications table. Every change is also published to
+open notification streams (see services/notification_stream.py).
+"""
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, column, func, insert, update, values
+from sqlalchemy.orm import Session
+
+from models import Notification, User
+from services.notification_stream import publish_unread_counts
+from utill.cursor import apply_keyset, next_cursor
+
+
+def create_notifications(db: Session, rows: List[dict]) -> None:
+    """Bulk-insert notification rows and bump their recipients' unread counts in the caller's transaction."""
+    if not rows:
+        return
+    db.execute(insert(Notification), rows)
+    added = values(column("id", Integer), column("n", Integer), name="added_notifications").data(
+        sorted(Counter(row["user_id"] for row in rows).items())
+    )
+    counts = db.execute(
+        update(User)
+        .where(User.id == added.c.id)
+        .values(unread_notification_count=User.unread_notification_count + added.c.n)
+        .returning(User.id, User.unread_notification_count)
+    ).all()
+    publish_unread_counts(db, counts)
+
+
+def list_notifications(
+    db: Session, current_user: User, page_size: int, cursor: Optional[str] = None, unread_only: bool = False
+) -> Tuple[List[Notification], Optional[str]]:
+    """Newest-first page of the user's notifications, served by ix_notifications_user_id_created_at_id."""
+    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    if unread_only:
+        query = query.filter(Notification.is_read.isnot(True))
+    notifications = apply_keyset(query, Notification.created_at, Notification.id, cursor).limit(page_size).all()
+    return notifications, next_cursor(notifications, page_size)
+
+
+def mark_notifications_read(db: Session, current_user: User, ids: Optional[List[int]] = None) -> int:
+    """Mark the given notifications (all of them when ids is None) as read. Returns the new unread count."""
+    stmt = update(Notification).where(Notification.user_id == current_user.id, Notification.is_read.isnot(True))
+    if ids is not None:
+        if not ids:
+            return current_user.unread_notification_count
+        stmt = stmt.where(Notification.id.in_(set(ids)))
+    marked = len(db.execute(stmt.values(is_read=True).returning(Notification.id)).all())
+
+    if marked:
+        counts = db.execute(
+            update(User)
+            .where(User.id == current_user.id)
+            .values(unread_notification_count=func.greatest(User.unread_notification_count - marked, 0))
+            .returning(User.id, User.unread_notification_count)
+        ).all()
+        publish_unread_counts(db, counts)  # 같은 사용자의 다른 기기 배지 갱신
+    db.commit()
+    db.refresh(current_user, ["unread_notification_count"])
+    return current_user.unread_notification_count
+
+
+def get_unread_count(current_user: User) -> int:
+    return current_user.unread_notification_count
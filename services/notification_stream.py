@@ -0,0 +1,143 @@
+"""
+Server-sent notification events.
+
+Writers announce a user's new unread count with pg_notify on NOTIFY_CHANNEL
+inside their own transaction, so the event is delivered only if they commit.
+Each worker process keeps exactly one extra database connection that LISTENs
+on the channel from a background thread and hands events to the event loop.
+That way every gunicorn worker sees every event, whichever worker wrote it.
+
+An open stream holds no database connection. It holds one single-slot queue
+that always keeps only the newest count, because a newer count supersedes an
+older one. Thousands of idle streams therefore cost a few hundred bytes each.
+"""
+import asyncio
+import json
+import os
+import select
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+import psycopg2
+import psycopg2.extensions
+from sqlalchemy import text
+
+from database import engine
+
+NOTIFY_CHANNEL = "notification_events"
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("NOTIFICATION_STREAM_HEARTBEAT_SECONDS", "25"))
+LISTEN_POLL_SECONDS = 1.0
+LISTEN_RETRY_SECONDS = 5.0
+
+_NOTIFY_SQL = text(f"SELECT pg_notify('{NOTIFY_CHANNEL}', :payload)")
+
+
+def publish_unread_counts(executor, counts: Iterable[Tuple[int, int]]) -> None:
+    """Announce (user_id, unread_count) pairs. Delivered when the caller's transaction commits.
+
+    executor is a Session or a Connection (inside flush events).
+    """
+    payloads = [{"payload": json.dumps({"u": user_id, "c": count})} for user_id, count in counts]
+    if payloads:
+        executor.execute(_NOTIFY_SQL, payloads)
+
+
+class NotificationBus:
+    def __init__(self):
+        # Only touched from the event loop thread.
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self):
+        conn = psycopg2.connect(**engine.url.translate_connect_args(username="user", database="dbname"))
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return conn
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Error in notification listener: {e}")
+                self._stop.wait(LISTEN_RETRY_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            user_id, count = int(data["u"]), int(data["c"])
+        except (ValueError, KeyError, TypeError):
+            return
+        self._loop.call_soon_threadsafe(self._deliver, user_id, count)
+
+    def _deliver(self, user_id: int, count: int) -> None:
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(count)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Queue that receives the user's latest unread count whenever it changes."""
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def start(self) -> None:
+        """Start listening. Must be called from the event loop that serves the streams."""
+        if self._thread is None or not self._thread.is_alive():
+            self._loop = asyncio.get_running_loop()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._listen, name="notification-listener", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=LISTEN_POLL_SECONDS + 1)
+            self._thread = None
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def unread_count_events(user_id: int, unread_count: int) -> AsyncIterator[str]:
+    """SSE stream: the current unread count first, then every change, with comment heartbeats in between."""
+    async with notification_bus.subscribe(user_id) as queue:
+        yield _sse("unread_count", {"unread_count": unread_count})
+        while True:
+            try:
+                unread_count = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse("unread_count", {"unread_count": unread_count})
+
+
+notification_bus = NotificationBus()
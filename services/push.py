@@ -0,0 +1,157 @@
+"""
+Out-of-band push notification delivery.
+
+Request handlers never talk to FCM. They enqueue PushMessage items after their
+transaction commits, and a background thread delivers them. The queue is
+flushed as soon as something is enqueued, every PUSH_FLUSH_SECONDS as a
+fallback, and once more on application shutdown.
+
+Each flush sends the due messages in send_each batches of up to FCM_BATCH_SIZE.
+Throttling, FCM outages and network errors are retried with exponential
+backoff up to PUSH_MAX_ATTEMPTS. Tokens that FCM reports as invalid are cleared
+from every user holding them with one UPDATE. The queue lives in process
+memory, so messages still queued when the process dies are lost. The
+notification rows themselves are already committed.
+"""
+import os
+import threading
+import time
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import User
+from utill.periodic import PeriodicTask
+from utils.fcm import (
+    FCM_BATCH_SIZE, INVALID_TOKEN_ERRORS, MessagingBackend, build_message, get_messaging_backend, is_retryable
+)
+
+PUSH_FLUSH_SECONDS = float(os.getenv("PUSH_FLUSH_SECONDS", "1"))
+PUSH_MAX_ATTEMPTS = int(os.getenv("PUSH_MAX_ATTEMPTS", "5"))
+PUSH_RETRY_BASE_SECONDS = float(os.getenv("PUSH_RETRY_BASE_SECONDS", "2"))
+PUSH_MAX_BACKOFF_SECONDS = 300
+
+MENTION_TITLE = "새로운 멘션 알림"
+
+
+class PushMessage(NamedTuple):
+    user_id: int
+    token: str
+    body: str
+    title: str = MENTION_TITLE
+
+
+class _QueuedPush(NamedTuple):
+    message: PushMessage
+    attempts: int
+    due: float  # time.monotonic()
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(PUSH_RETRY_BASE_SECONDS * 2 ** (attempts - 1), PUSH_MAX_BACKOFF_SECONDS)
+
+
+class PushDispatcher:
+    def __init__(self, interval: float):
+        self._lock = threading.Lock()
+        self._pending: List[_QueuedPush] = []
+        self._metrics = {"batches": 0, "sent": 0, "retried": 0, "failed": 0, "invalid_tokens": 0}
+        self._task = PeriodicTask("push-dispatcher", interval, self.flush_with_new_session)
+
+    def enqueue(self, messages: Iterable[PushMessage]) -> None:
+        now = time.monotonic()
+        queued = [_QueuedPush(message, 0, now) for message in messages]
+        if not queued:
+            return
+        with self._lock:
+            self._pending.extend(queued)
+        self._task.trigger()
+
+    def _take_due(self, now: Optional[float]) -> List[_QueuedPush]:
+        """Remove and return the queued messages due at now (all of them when now is None)."""
+        with self._lock:
+            if now is None:
+                due, self._pending = self._pending, []
+            else:
+                due = [item for item in self._pending if item.due <= now]
+                self._pending = [item for item in self._pending if item.due > now]
+        return due
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for key, delta in deltas.items():
+                self._metrics[key] += delta
+
+    def flush(self, db: Session, backend: MessagingBackend, now: Optional[float] = None) -> int:
+        """Send every due message. Returns the number of messages handled.
+
+        now defaults to the current time; pass float("inf") to also send messages waiting for a retry.
+        """
+        due = self._take_due(time.monotonic() if now is None else now)
+        if not due:
+            return 0
+
+        retry: List[_QueuedPush] = []
+        invalid_tokens = set()
+        sent = failed = 0
+        for start in range(0, len(due), FCM_BATCH_SIZE):
+            batch = due[start:start + FCM_BATCH_SIZE]
+            messages = [build_message(item.message.token, item.message.title, item.message.body) for item in batch]
+            try:
+                errors = backend.send_each(messages)
+            except Exception as e:
+                errors = [e] * len(batch)
+
+            for item, error in zip(batch, errors):
+                if error is None:
+                    sent += 1
+                elif isinstance(error, INVALID_TOKEN_ERRORS):
+                    invalid_tokens.add(item.message.token)
+                elif is_retryable(error) and item.attempts + 1 < PUSH_MAX_ATTEMPTS:
+                    attempts = item.attempts + 1
+                    retry.append(_QueuedPush(item.message, attempts, time.monotonic() + _retry_delay(attempts)))
+                else:
+                    failed += 1
+                    print(f"Error sending push to user {item.message.user_id}: {error}")
+
+        if retry:
+            with self._lock:
+                self._pending.extend(retry)
+        if invalid_tokens:
+            # Matching on the token leaves users alone who have registered a new one in the meantime.
+            db.execute(
+                update(User)
+                .where(User.fcm_token.in_(invalid_tokens))
+                .values(fcm_token=None, fcm_token_updated_at=None)
+            )
+            db.commit()
+
+        self._count(
+            batches=-(-len(due) // FCM_BATCH_SIZE), sent=sent, retried=len(retry),
+            failed=failed, invalid_tokens=len(invalid_tokens),
+        )
+        return len(due)
+
+    def flush_with_new_session(self, now: Optional[float] = None) -> int:
+        db = SessionLocal()
+        try:
+            return self.flush(db, get_messaging_backend(), now)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        self._task.start()
+
+    def stop(self) -> None:
+        """Stop the worker and make one last attempt at everything still queued."""
+        self._task.stop()
+        self.flush_with_new_session(now=float("inf"))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._metrics, "pending": len(self._pending)}
+
+
+push_dispatcher = PushDispatcher(interval=PUSH_FLUSH_SECONDS)
@@ -0,0 +1,115 @@
+"""
+Buffered post read counting.
+
+get_board records views in a per-worker buffer instead of updating the post
+row on every request. A background thread folds the buffer into the database
+every READ_COUNT_FLUSH_SECONDS with one batched UPDATE ... FROM (VALUES ...).
+The buffer is also flushed on application shutdown.
+"""
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+from sqlalchemy import Integer, update, values, column, func
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import Post
+from utill.hyperloglog import HyperLogLog
+from utill.periodic import PeriodicTask
+
+READ_COUNT_FLUSH_SECONDS = float(os.getenv("READ_COUNT_FLUSH_SECONDS", "10"))
+
+
+class ReadCountBuffer:
+    def __init__(self, flush_interval: float):
+        self._lock = threading.Lock()
+        self._counts: Dict[int, int] = defaultdict(int)
+        self._viewers: Dict[int, HyperLogLog] = {}
+        self._flusher = PeriodicTask("read-count-flusher", flush_interval, self.flush_with_new_session)
+
+    def record(self, post_id: int, viewer_id: Optional[int] = None) -> None:
+        with self._lock:
+            self._counts[post_id] += 1
+            if viewer_id is not None:
+                sketch = self._viewers.get(post_id)
+                if sketch is None:
+                    sketch = self._viewers[post_id] = HyperLogLog()
+                sketch.add(viewer_id)
+
+    def _drain(self):
+        with self._lock:
+            counts, viewers = self._counts, self._viewers
+            self._counts, self._viewers = defaultdict(int), {}
+        return counts, viewers
+
+    def _restore(self, counts: Dict[int, int], viewers: Dict[int, HyperLogLog]) -> None:
+        with self._lock:
+            for post_id, count in counts.items():
+                self._counts[post_id] += count
+            for post_id, sketch in viewers.items():
+                if post_id in self._viewers:
+                    self._viewers[post_id].merge(sketch)
+                else:
+                    self._viewers[post_id] = sketch
+
+    def flush(self, db: Session) -> int:
+        """Write buffered counts in one transaction. Returns the number of posts updated."""
+        counts, viewers = self._drain()
+        if not counts:
+            return 0
+
+        try:
+            pending = values(
+                column("id", Integer), column("cnt", Integer), name="pending_reads"
+            ).data(list(counts.items()))
+            db.execute(
+                update(Post)
+                .where(Post.id == pending.c.id)
+                .values(read_count=func.coalesce(Post.read_count, 0) + pending.c.cnt)
+            )
+
+            if viewers:
+                rows = (
+                    db.query(Post.id, Post.viewer_sketch)
+                    .filter(Post.id.in_(viewers.keys()))
+                    .with_for_update()
+                    .all()
+                )
+                sketch_updates = []
+                for post_id, stored in rows:
+                    sketch = HyperLogLog(registers=stored)
+                    sketch.merge(viewers[post_id])
+                    sketch_updates.append({
+                        "id": post_id,
+                        "viewer_sketch": sketch.to_bytes(),
+                        "unique_viewer_count": sketch.count(),
+                    })
+                if sketch_updates:
+                    db.execute(update(Post), sketch_updates)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            self._restore(counts, viewers)
+            raise
+        return len(counts)
+
+    def flush_with_new_session(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        self._flusher.stop()
+        self.flush_with_new_session()
+
+
+read_count_buffer = ReadCountBuffer(flush_interval=READ_COUNT_FLUSH_SECONDS)
@@ -6,6 +6,7 @@ from starlette import status
 
 from models import Route, User
 import schemas.route as route_schema
+from utill.geo import bounding_box, sql_haversine_km
 
 def get_routes(db: Session) -> List[route_schema.Route]:
     query = db.query(Route)
@@ -22,6 +23,81 @@ def get_my_routes(
     routes = db.query(Route).filter(Route.user_id == current_user.id).order_by(Route.created_at.desc()).offset(skip).limit(page_size).all()
     return routes
 
+def _to_nearby_response(rows) -> List[route_schema.RouteNearbyResponse]:
+    response = []
+    for route, distance_km in rows:
+        response.append(route_schema.RouteNearbyResponse(
+            id=route.id,
+            name=route.name,
+            user_id=route.user_id,
+            created_at=route.created_at,
+            start_point=route.start_point,
+            end_point=route.end_point,
+            distance_km=distance_km,
+        ))
+    return response
+
+def get_routes_nearby(
+    db: Session,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    page: int,
+    page_size: int
+) -> List[route_schema.RouteNearbyResponse]:
+    """출발점이 반경 안에 있는 경로를 가까운 순으로 반환합니다."""
+    skip = (page - 1) * page_size
+    min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius_km)
+    distance = sql_haversine_km(Route.start_lat, Route.start_lon, lat, lon)
+
+    rows = (
+        db.query(Route, distance.label("distance_km"))
+        .filter(
+            Route.start_lat.between(min_lat, max_lat),
+            Route.start_lon.between(min_lon, max_lon),
+            distance <= radius_km,
+        )
+        .order_by(distance, Route.id)
+        .offset(skip)
+        .limit(page_size)
+        .all()
+    )
+    return _to_nearby_response(rows)
+
+def get_routes_in_viewport(
+    db: Session,
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    page: int,
+    page_size: int
+) -> List[route_schema.RouteNearbyResponse]:
+    """경로 영역이 화면 영역과 겹치는 경로를 화면 중심에서 가까운 순으로 반환합니다."""
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="Invalid viewport")
+
+    skip = (page - 1) * page_size
+    center_lat = (min_lat + max_lat) / 2
+    center_lon = (min_lon + max_lon) / 2
+    distance = sql_haversine_km(Route.start_lat, Route.start_lon, center_lat, center_lon)
+
+    rows = (
+        db.query(Route, distance.label("distance_km"))
+        .filter(
+            Route.min_lat <= max_lat,
+            Route.max_lat >= min_lat,
+            Route.min_lon <= max_lon,
+            Route.max_lon >= min_lon,
+            Route.start_lat.isnot(None),
+        )
+        .order_by(distance, Route.id)
+        .offset(skip)
+        .limit(page_size)
+        .all()
+    )
+    return _to_nearby_response(rows)
+
 def get_route_by_id(route_id: int, db: Session) -> route_schema.Route:
     route = db.query(Route).filter(Route.id == route_id).first()
     if route is None:
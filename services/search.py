@@ -0,0 +1,43 @@
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from models import Post
+from schemas.community import PostListItem
+from services.abstract.board_select import feed_post_query, post_list_items
+from utill.cursor import encode_rank_cursor, decode_rank_cursor
+from utill.search import search_query
+
+
+def search_posts(
+    db: Session,
+    q: str,
+    page_size: int = 10,
+    cursor: Optional[str] = None
+) -> Tuple[List[PostListItem], Optional[str]]:
+    """Public posts matching q, best match first (title hits outrank content hits).
+
+    Returns the page and the cursor for the next one.
+    """
+    tsquery_text = search_query(q)
+    if tsquery_text is None:
+        raise HTTPException(status_code=422, detail="검색어에 글자나 숫자가 포함되어야 합니다.")
+
+    tsquery = func.to_tsquery("simple", tsquery_text)
+    rank = func.ts_rank_cd(Post.search_vector, tsquery).label("rank")
+
+    query = (
+        feed_post_query(db, rank)
+        .filter(Post.public == True, Post.search_vector.op("@@")(tsquery))
+    )
+    if cursor:
+        last_rank, last_id = decode_rank_cursor(cursor)
+        query = query.filter(tuple_(rank, Post.id) < tuple_(last_rank, last_id))
+    rows = query.order_by(rank.desc(), Post.id.desc()).limit(page_size).all()
+
+    next_page_cursor = None
+    if len(rows) == page_size:
+        next_page_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+    return post_list_items(db, rows), next_page_cursor
@@ -0,0 +1,240 @@
+"""
+Deferred storage deletion.
+
+Code that drops a reference to a stored file records the URL in
+storage_cleanup_queue inside the same transaction (enqueue_storage_deletion,
+or the before_delete listeners in utils/events.py). Nothing is deleted from
+storage inside the request. After the transaction commits, a background worker
+claims pending rows with FOR UPDATE SKIP LOCKED, deletes the files in batches
+(S3 DeleteObjects, up to 1000 keys per call) and removes the rows that
+succeeded. Failed rows are retried with exponential backoff until
+STORAGE_CLEANUP_MAX_ATTEMPTS, then kept as dead entries for inspection.
+
+Content-addressed files (see services/upload.save_uploaded_files) and presigned
+uploads (services/upload.resolve_uploaded_keys) can be shared, so they carry a
+reference count in stored_objects. Releasing a URL only queues the file once its
+count reaches zero, and the worker re-checks the count under a row lock right
+before deleting. A presigned upload is queued as soon as its URL is issued, due
+at its attach deadline: if no post or profile has referenced it by then, the
+worker deletes it like any other unreferenced file.
+"""
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, update, values, column, String, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from dependencies import get_storage_manager_instance
+from models import StorageCleanup, StoredObject
+from storage.base import BaseStorage
+from utill.periodic import PeriodicTask
+
+STORAGE_CLEANUP_SECONDS = float(os.getenv("STORAGE_CLEANUP_SECONDS", "5"))
+STORAGE_CLEANUP_BATCH_SIZE = int(os.getenv("STORAGE_CLEANUP_BATCH_SIZE", "1000"))
+STORAGE_CLEANUP_MAX_ATTEMPTS = int(os.getenv("STORAGE_CLEANUP_MAX_ATTEMPTS", "8"))
+STORAGE_CLEANUP_MAX_BACKOFF_SECONDS = 3600
+
+# Session.info flag telling the after_commit hook to wake the worker
+PENDING_FLAG = "storage_cleanup_pending"
+
+
+def acquire_stored_objects(db: Session, objects: List[Tuple[str, Optional[int]]]) -> None:
+    """Add one reference per (url, size) to shared files.
+
+    The upsert keeps the rows locked until the caller commits, so the cleanup
+    worker cannot delete a file between deduplication and commit. The size of
+    an existing row is kept.
+    """
+    counts = Counter(url for url, _ in objects)
+    if not counts:
+        return
+    sizes = dict(objects)
+    stmt = pg_insert(StoredObject).values([
+        {"url": url, "size": sizes[url], "ref_count": count} for url, count in sorted(counts.items())
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[StoredObject.url],
+        set_={"ref_count": StoredObject.ref_count + stmt.excluded.ref_count},
+    ))
+
+
+def register_pending_uploads(db: Session, objects: List[Tuple[str, int]], attach_deadline: datetime) -> None:
+    """Track presigned uploads that nothing references yet, in the caller's transaction.
+
+    Each (url, size) gets a stored_objects row with ref_count 0 and a cleanup
+    entry due at attach_deadline. Attaching the upload raises the count, so the
+    worker then only drops the entry; otherwise it deletes the file.
+    """
+    if not objects:
+        return
+    db.execute(
+        pg_insert(StoredObject)
+        .values([{"url": url, "size": size, "ref_count": 0} for url, size in objects])
+        .on_conflict_do_nothing(index_elements=[StoredObject.url])
+    )
+    db.execute(insert(StorageCleanup), [{"url": url, "next_attempt_at": attach_deadline} for url, _ in objects])
+
+
+def release_storage_urls(executor, file_urls: Iterable[str]) -> bool:
+    """Drop one reference per URL and queue the files nothing refers to any more.
+
+    executor is a Session or a Connection (inside flush events). Returns True if anything was queued.
+    """
+    counts = Counter(file_url for file_url in file_urls if file_url)
+    if not counts:
+        return False
+
+    released = values(column("url", String), column("n", Integer), name="released").data(list(counts.items()))
+    still_referenced = {
+        url for url, ref_count in executor.execute(
+            update(StoredObject)
+            .where(StoredObject.url == released.c.url)
+            .values(ref_count=func.greatest(StoredObject.ref_count - released.c.n, 0))
+            .returning(StoredObject.url, StoredObject.ref_count)
+        )
+        if ref_count > 0
+    }
+    queued = [{"url": url} for url in counts if url not in still_referenced]
+    if queued:
+        executor.execute(insert(StorageCleanup), queued)
+    return bool(queued)
+
+
+def enqueue_storage_deletion(db: Session, file_urls: Iterable[str]) -> None:
+    """Release files in the caller's transaction; unreferenced ones are deleted after commit."""
+    if release_storage_urls(db, file_urls):
+        db.info[PENDING_FLAG] = True
+
+
+def discard_uploaded_files(file_urls: Iterable[str]) -> None:
+    """Queue files that were uploaded for a transaction that did not commit.
+
+    Uses its own session because the caller's was rolled back. Shared
+    content-addressed files survive, since the worker skips referenced URLs.
+    """
+    rows = [{"url": file_url} for file_url in file_urls if file_url]
+    if not rows:
+        return
+    db = SessionLocal()
+    try:
+        db.execute(insert(StorageCleanup), rows)
+        db.commit()
+    finally:
+        db.close()
+    storage_cleanup_worker.trigger()
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(STORAGE_CLEANUP_SECONDS * 2 ** attempts, STORAGE_CLEANUP_MAX_BACKOFF_SECONDS))
+
+
+class StorageCleanupWorker:
+    def __init__(self, interval: float, batch_size: int):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._metrics = {"batches": 0, "deleted": 0, "failed": 0, "dead": 0, "still_referenced": 0}
+        self._task = PeriodicTask("storage-cleanup", interval, self.run_with_new_session)
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for key, delta in deltas.items():
+                self._metrics[key] += delta
+
+    def process_batch(self, db: Session, storage: BaseStorage) -> int:
+        """Delete one batch of due files. Returns the number of queue rows handled."""
+        rows = (
+            db.query(StorageCleanup)
+            .filter(
+                StorageCleanup.next_attempt_at <= func.now(),
+                StorageCleanup.attempts < STORAGE_CLEANUP_MAX_ATTEMPTS,
+            )
+            .order_by(StorageCleanup.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not rows:
+            db.rollback()
+            return 0
+
+        urls = {row.url for row in rows}
+        # Locked until commit, so nothing can take a new reference while the files are being deleted.
+        ref_counts = dict(
+            db.query(StoredObject.url, StoredObject.ref_count)
+            .filter(StoredObject.url.in_(urls))
+            .with_for_update()
+            .all()
+        )
+        referenced = {url for url, ref_count in ref_counts.items() if ref_count > 0}
+        to_delete = urls - referenced
+
+        errors = storage.delete_batch(list(to_delete))
+
+        deleted_urls = [url for url in to_delete if url not in errors and url in ref_counts]
+        if deleted_urls:
+            db.execute(delete(StoredObject).where(StoredObject.url.in_(deleted_urls)))
+
+        done_ids = [row.id for row in rows if row.url not in errors]
+        if done_ids:
+            db.execute(delete(StorageCleanup).where(StorageCleanup.id.in_(done_ids)))
+
+        now = datetime.now(timezone.utc)
+        dead = 0
+        for row in rows:
+            if row.url in errors:
+                row.attempts += 1
+                row.last_error = errors[row.url][:500]
+                row.next_attempt_at = now + _retry_delay(row.attempts)
+                if row.attempts >= STORAGE_CLEANUP_MAX_ATTEMPTS:
+                    dead += 1
+        db.commit()
+
+        skipped = sum(1 for row in rows if row.url in referenced)
+        self._count(
+            batches=1, deleted=len(done_ids) - skipped, failed=len(rows) - len(done_ids), dead=dead, still_referenced=skipped
+        )
+        return len(rows)
+
+    def run(self, db: Session, storage: BaseStorage) -> int:
+        """Drain every due row. Returns the number of queue rows handled."""
+        handled = 0
+        while True:
+            processed = self.process_batch(db, storage)
+            handled += processed
+            if processed < self.batch_size:
+                return handled
+
+    def run_with_new_session(self) -> int:
+        db = SessionLocal()
+        try:
+            return self.run(db, get_storage_manager_instance())
+        finally:
+            db.close()
+
+    def trigger(self) -> None:
+        self._task.trigger()
+
+    def start(self) -> None:
+        self._task.start()
+
+    def stop(self) -> None:
+        self._task.stop()
+
+    def stats(self, db: Session) -> dict:
+        pending, dead = db.query(
+            func.count().filter(StorageCleanup.attempts < STORAGE_CLEANUP_MAX_ATTEMPTS),
+            func.count().filter(StorageCleanup.attempts >= STORAGE_CLEANUP_MAX_ATTEMPTS),
+        ).select_from(StorageCleanup).one()
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {**metrics, "pending": pending, "dead_entries": dead}
+
+
+storage_cleanup_worker = StorageCleanupWorker(
+    interval=STORAGE_CLEANUP_SECONDS, batch_size=STORAGE_CLEANUP_BATCH_SIZE
+)
@@ -0,0 +1,96 @@
+"""
+Trending hashtags.
+
+tag_trends keeps one exponentially decayed score per tag. Each public post adds
+1 to each of its tags when it is written, and that weight halves every
+TAG_TREND_HALF_LIFE_HOURS. Writes fold the elapsed decay into the stored score
+(score * 0.5^(elapsed / half-life) + delta), so trending never scans posts.
+Readers apply the decay from updated_at to now.
+
+Tags are stored normalized (normalize_tags), so ?tag= lookups, the GIN index
+and the trend counters all see the same spelling.
+"""
+import os
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Float, Integer, String, column, func, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from models import Post, TagTrend
+from schemas.community import TrendingTag
+
+TAG_TREND_HALF_LIFE_HOURS = float(os.getenv("TAG_TREND_HALF_LIFE_HOURS", "24"))
+
+
+def normalize_tag(tag: str) -> str:
+    return tag.strip().lstrip("#")
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
+    """Normalized tags without blanks or duplicates, in their original order."""
+    return list(dict.fromkeys(t for t in (normalize_tag(tag) for tag in tags or []) if t))
+
+
+def _decayed_score():
+    elapsed_hours = func.extract("epoch", func.now() - TagTrend.updated_at) / 3600.0
+    return TagTrend.score * func.power(0.5, elapsed_hours / TAG_TREND_HALF_LIFE_HOURS)
+
+
+def post_weight(post: Post) -> float:
+    """What one post currently contributes to each of its tags' scores."""
+    if post.created_at is None:
+        return 1.0
+    age_hours = (datetime.now(timezone.utc) - post.created_at).total_seconds() / 3600.0
+    return 0.5 ** (max(age_hours, 0.0) / TAG_TREND_HALF_LIFE_HOURS)
+
+
+def adjust_tag_trends(
+    db: Session,
+    added: Optional[Iterable[str]] = None,
+    removed: Optional[Iterable[str]] = None,
+    removed_weight: float = 1.0
+) -> None:
+    """Add new tags at full weight and take removed_weight back from removed tags, in the caller's transaction."""
+    added_tags, removed_tags = set(normalize_tags(added)), set(normalize_tags(removed))
+    # 추가와 삭제가 겹치면 변화 없음. 정렬은 행 잠금 순서를 고정해 교착을 막는다.
+    added_tags, removed_tags = sorted(added_tags - removed_tags), sorted(removed_tags - added_tags)
+
+    if added_tags:
+        stmt = pg_insert(TagTrend).values([{"tag": tag, "score": 1.0, "post_count": 1} for tag in added_tags])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[TagTrend.tag],
+            set_={
+                "score": _decayed_score() + stmt.excluded.score,
+                "post_count": TagTrend.post_count + stmt.excluded.post_count,
+                "updated_at": func.now(),
+            },
+        ))
+
+    if removed_tags:
+        # Only existing rows: a removal must never create a negative one.
+        removals = values(
+            column("tag", String), column("score", Float), column("post_count", Integer), name="removed_tags"
+        ).data([(tag, removed_weight, 1) for tag in removed_tags])
+        db.execute(
+            update(TagTrend)
+            .where(TagTrend.tag == removals.c.tag)
+            .values(
+                score=func.greatest(_decayed_score() - removals.c.score, 0),
+                post_count=func.greatest(TagTrend.post_count - removals.c.post_count, 0),
+                updated_at=func.now(),
+            )
+        )
+
+
+def get_trending_tags(db: Session, limit: int = 10) -> List[TrendingTag]:
+    score = _decayed_score().label("score")
+    rows = (
+        db.query(TagTrend.tag, score, TagTrend.post_count)
+        .filter(TagTrend.post_count > 0)
+        .order_by(score.desc(), TagTrend.tag)
+        .limit(limit)
+        .all()
+    )
+    return [TrendingTag(tag=tag, score=round(value, 4), post_count=post_count) for tag, value, post_count in rows]
@@ -0,0 +1,167 @@
+"""
+Direct-to-storage uploads.
+
+The client asks for presigned upload URLs (presign_uploads), PUTs the bytes
+straight to S3 (or to the signed local upload endpoint), then references the
+returned keys when creating or updating a post or profile. resolve_uploaded_keys
+checks ownership, existence, size and content type before a key is stored, and
+takes one stored_objects reference per use, so a key attached twice is only
+deleted once both references are gone. Keys that are never attached are deleted
+PRESIGN_ATTACH_GRACE_SECONDS after their upload URL expires.
+
+Files uploaded through the API go through save_uploaded_files. With
+STORAGE_DEDUP they are named by their SHA-256, so identical bytes are stored
+once and shared through the reference counts in stored_objects.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, List, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+
+from models.user import User
+from schemas.upload import PresignRequest, PresignedUpload
+from storage.base import BaseStorage
+from storage.local import LocalStorage
+from services.storage_cleanup import acquire_stored_objects, discard_uploaded_files, register_pending_uploads
+
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+PRESIGN_EXPIRES_SECONDS = int(os.getenv("PRESIGN_EXPIRES_SECONDS", "900"))
+# 업로드를 마친 뒤 글/프로필에 붙이기까지 허용하는 시간. 지나면 붙지 않은 파일은 정리된다.
+PRESIGN_ATTACH_GRACE_SECONDS = int(os.getenv("PRESIGN_ATTACH_GRACE_SECONDS", str(24 * 3600)))
+STORAGE_DEDUP = os.getenv("STORAGE_DEDUP", "true").lower() in ("1", "true", "yes")
+
+ALLOWED_IMAGE_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+    "image/heic": "heic",
+}
+
+
+def _key_prefix(folder: str, user: User) -> str:
+    return f"{folder}/{user.id}/"
+
+
+def save_uploaded_files(
+    db: Session,
+    storage: BaseStorage,
+    files: List[Tuple[UploadFile, str]],
+    folder: str
+) -> List[str]:
+    """Stores (file, filename) pairs and returns their URLs in the same order.
+
+    With STORAGE_DEDUP the name is the SHA-256 of the content plus the original
+    extension. An existing object is reused instead of uploaded again, and a
+    reference is added in the caller's transaction.
+    """
+    if not files:
+        return []
+    if not STORAGE_DEDUP:
+        return storage.save_many(files, folder=folder)
+
+    staged = storage.stage_many([file for file, _ in files], folder)
+    try:
+        keys = [
+            f"{folder}/{staged_file.sha256}.{filename.rsplit('.', 1)[-1].lower()}"
+            for staged_file, (_, filename) in zip(staged, files)
+        ]
+        # Reference first: the locked rows keep the cleanup worker away until commit.
+        acquire_stored_objects(db, [(storage.url_for(key), staged_file.size) for staged_file, key in zip(staged, keys)])
+        try:
+            return storage.store_staged_many(list(zip(staged, keys)))
+        except Exception:
+            discard_uploaded_files(storage.url_for(key) for key in keys)
+            raise
+    finally:
+        for staged_file in staged:
+            staged_file.close()
+
+
+def presign_uploads(db: Session, request: PresignRequest, storage: BaseStorage, current_user: User) -> List[PresignedUpload]:
+    for spec in request.files:
+        if spec.content_type not in ALLOWED_IMAGE_TYPES:
+            raise HTTPException(status_code=422, detail=f"지원하지 않는 파일 형식입니다: {spec.content_type}")
+        if spec.size > UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="파일이 너무 큽니다.")
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=PRESIGN_EXPIRES_SECONDS)
+    uploads = []
+    for spec in request.files:
+        key = f"{_key_prefix(request.purpose, current_user)}{uuid.uuid4()}.{ALLOWED_IMAGE_TYPES[spec.content_type]}"
+        presigned = storage.presign_upload(key, spec.content_type, spec.size, PRESIGN_EXPIRES_SECONDS)
+        uploads.append(PresignedUpload(key=key, expires_at=expires_at, **presigned))
+
+    register_pending_uploads(
+        db,
+        [(storage.url_for(upload.key), spec.size) for upload, spec in zip(uploads, request.files)],
+        attach_deadline=expires_at + timedelta(seconds=PRESIGN_ATTACH_GRACE_SECONDS),
+    )
+    db.commit()
+    return uploads
+
+
+def resolve_uploaded_keys(
+    db: Session, storage: BaseStorage, keys: List[str], folder: str, current_user: User
+) -> List[str]:
+    """Verifies directly uploaded keys and returns their URLs in the same order.
+
+    Adds one reference per key (repeated keys count once per use) in the
+    caller's transaction, so the caller must commit or roll back.
+    """
+    for key in keys:
+        if not key.startswith(_key_prefix(folder, current_user)) or ".." in key:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="사용할 수 없는 업로드 키입니다.")
+
+    urls = [storage.url_for(key) for key in keys]
+    # Reference before checking the file: once the row is locked, the cleanup
+    # worker either has already deleted the file (stat fails) or has to wait.
+    acquire_stored_objects(db, [(url, None) for url in urls])
+
+    for key in keys:
+        stored = storage.stat(key)
+        if stored is None:
+            raise HTTPException(status_code=422, detail=f"업로드된 파일을 찾을 수 없습니다: {key}")
+        size, content_type = stored
+        if size > UPLOAD_MAX_BYTES:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="파일이 너무 큽니다.")
+        if content_type not in ALLOWED_IMAGE_TYPES:
+            raise HTTPException(status_code=422, detail=f"지원하지 않는 파일 형식입니다: {content_type}")
+    return urls
+
+
+async def receive_signed_upload(
+    token: str,
+    content_type: str,
+    body: AsyncIterator[bytes],
+    storage: BaseStorage
+) -> None:
+    """Stores the body of a PUT to a signed local upload URL."""
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    try:
+        claims = storage.verify_upload_token(token)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="업로드 URL이 유효하지 않거나 만료되었습니다.")
+    if content_type != claims["content_type"]:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Content-Type이 일치하지 않습니다.")
+    if storage.stat(claims["key"]) is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 업로드된 파일입니다.")
+
+    with SpooledTemporaryFile(max_size=1024 * 1024) as buffer:
+        received = 0
+        async for chunk in body:
+            received += len(chunk)
+            if received > claims["size"]:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="파일이 너무 큽니다.")
+            buffer.write(chunk)
+        if received != claims["size"]:
+            raise HTTPException(status_code=400, detail="파일 크기가 요청과 다릅니다.")
+        buffer.seek(0)
+
+        folder, filename = claims["key"].rsplit("/", 1)
+        await storage.asave(UploadFile(file=buffer, filename=filename), filename, folder)
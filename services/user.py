@@ -10,7 +10,9 @@ from starlette import status
 
 from models.user import User
 from schemas.user import UserUpdate, FCMTokenUpdate, ProfileDescriptionStatus
-from storage.base import BaseStorage
+from storage.base import BaseStorage, FileTooLargeError, content_hash_of
+from services.upload import resolve_uploaded_keys, save_uploaded_files
+from services.storage_cleanup import enqueue_storage_deletion
 
 def get_user_profile(user_id: int, db: Session) -> User:
     user = db.query(User).filter(User.id == user_id).first()
@@ -18,6 +20,20 @@ def get_user_profile(user_id: int, db: Session) -> User:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
 
+def _acquired_profile_pic(storage: BaseStorage, user: User, url: Optional[str]) -> bool:
+    """True if url is a profile picture this user took a storage reference on.
+
+    Presigned keys live under profile/{user_id}/, direct uploads are named
+    profile_pic_{user_id}_* or, with dedup, by their SHA-256. Raw storage URLs are
+    rejected by update_my_profile, so a content-addressed URL can only get here
+    through the user's own upload.
+    """
+    if not url:
+        return False
+    if url.startswith(storage.url_for(f"profile/{user.id}/")) or url.startswith(storage.url_for(f"profile/profile_pic_{user.id}_")):
+        return True
+    return url.startswith(storage.url_for("profile/")) and content_hash_of(url) is not None
+
 def update_my_profile(
     db: Session,
     current_user: User,
@@ -32,16 +48,40 @@ def update_my_profile(
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.errors())
 
-    for field, value in user_update_schema.dict(exclude_unset=True).items():
+    old_profile_pic = current_user.profile_pic
+    # 저장소 주소는 업로드(profile_pic_file / profile_pic_key)로만 지정할 수 있다.
+    # 다른 사용자의 파일을 가리키게 한 뒤 교체해 지워버리는 것을 막는다.
+    new_profile_pic = user_update_schema.profile_pic
+    if (
+        "profile_pic" in user_update_schema.model_fields_set
+        and new_profile_pic
+        and new_profile_pic != old_profile_pic
+        and new_profile_pic.startswith(storage.url_for(""))
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="사용할 수 없는 프로필 이미지 주소입니다.")
+
+    for field, value in user_update_schema.dict(exclude_unset=True, exclude={"profile_pic_key"}).items():
         setattr(current_user, field, value)
 
+    if user_update_schema.profile_pic_key:
+        current_user.profile_pic = resolve_uploaded_keys(db, storage, [user_update_schema.profile_pic_key], "profile", current_user)[0]
+
     if profile_pic_file:
         file_extension = profile_pic_file.filename.split(".")[-1]
         filename = f"profile_pic_{current_user.id}_{uuid.uuid4()}.{file_extension}"
         
-        profile_pic_url = storage.save(file=profile_pic_file, filename=filename, folder="profile")
+        try:
+            profile_pic_url = save_uploaded_files(db, storage, [(profile_pic_file, filename)], folder="profile")[0]
+        except FileTooLargeError:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="파일이 너무 큽니다.")
         
         current_user.profile_pic = profile_pic_url
+
+    # 소셜 로그인 프로필 URL 등 외부 주소나 이 사용자가 올리지 않은 파일은 건드리지 않는다.
+    # 같은 키를 다시 보내도 참조가 하나 늘었으므로 이전 참조는 놓아준다.
+    replaced = profile_pic_file or user_update_schema.profile_pic_key or old_profile_pic != current_user.profile_pic
+    if replaced and _acquired_profile_pic(storage, current_user, old_profile_pic):
+        enqueue_storage_deletion(db, [old_profile_pic])
     
     db.add(current_user)
     db.commit()
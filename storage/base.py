@@ -1,6 +1,66 @@
+import os
+import re
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from tempfile import SpooledTemporaryFile
 from fastapi import UploadFile
-from typing import Optional
+from starlette.datastructures import Headers
+from typing import Optional, List, Tuple, Dict, Callable, Any
+
+# Shared across requests so the total number of in-flight uploads per worker stays bounded.
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "8"))
+_upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="storage-upload")
+
+STAGE_BUFFER_SIZE = 1024 * 1024
+STAGE_MAX_BYTES = int(os.getenv("STORAGE_STAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# Content-addressed names (<sha256>.<ext>) never change content, so they can be cached forever.
+_CONTENT_ADDRESSED_NAME = re.compile(r"^([0-9a-f]{64})\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=86400"
+
+
+def content_hash_of(filename: str) -> Optional[str]:
+    """SHA-256 encoded in a content-addressed file name, or None for other names."""
+    match = _CONTENT_ADDRESSED_NAME.match(os.path.basename(filename))
+    return match.group(1) if match else None
+
+
+def cache_control_for(filename: str) -> str:
+    return IMMUTABLE_CACHE_CONTROL if content_hash_of(filename) else DEFAULT_CACHE_CONTROL
+
+
+class FileTooLargeError(ValueError):
+    """Raised by save when a file is larger than the storage accepts."""
+
+
+class StagedFile:
+    """Upload that was hashed while being streamed to a temporary location (see BaseStorage.stage)."""
+
+    def __init__(self, sha256: str, size: int, content_type: Optional[str], file=None, path: Optional[str] = None):
+        self.sha256 = sha256
+        self.size = size
+        self.content_type = content_type
+        self.file = file
+        self.path = path
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _run_all(calls: List[Callable[[], Any]]) -> Tuple[list, list]:
+    """Runs calls on the shared upload pool. Returns (results, errors); failed calls have None as result."""
+    futures = [_upload_executor.submit(call) for call in calls]
+    wait(futures)
+    results = [None if future.exception() else future.result() for future in futures]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    return results, errors
+
 
 class BaseStorage(ABC):
     @abstractmethod
@@ -13,4 +73,95 @@ class BaseStorage(ABC):
         """Deletes the file from the storage."""
         pass
 
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        """Returns the URL of a stored key ("folder/filename")."""
+        pass
+
+    @abstractmethod
+    def presign_upload(self, key: str, content_type: str, size: int, expires_in: int) -> dict:
+        """Returns {"upload_url", "method", "headers"} that let a client upload key directly."""
+        pass
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[Tuple[int, Optional[str]]]:
+        """Returns (size, content_type) of a stored key, or None if it does not exist."""
+        pass
+
+    async def asave(self, file: UploadFile, filename: str, folder: Optional[str] = None) -> str:
+        """save() on the shared upload pool, for async handlers that must not block the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_upload_executor, self.save, file, filename, folder)
+
+    def save_many(self, files: List[Tuple[UploadFile, str]], folder: Optional[str] = None) -> List[str]:
+        """Saves (file, filename) pairs concurrently and returns their URLs in the same order.
+
+        If any upload fails, the files that were already stored are deleted and the first error is raised.
+        """
+        urls, errors = _run_all([
+            lambda file=file, filename=filename: self.save(file, filename, folder) for file, filename in files
+        ])
+        if errors:
+            self.delete_many([url for url in urls if url is not None])
+            raise errors[0]
+        return urls
+
+    def stage(self, file: UploadFile, folder: Optional[str] = None) -> StagedFile:
+        """Streams the upload to a temporary file while computing its SHA-256, without storing it yet."""
+        hasher = hashlib.sha256()
+        buffer = SpooledTemporaryFile(max_size=STAGE_BUFFER_SIZE)
+        size = 0
+        try:
+            while chunk := file.file.read(STAGE_BUFFER_SIZE):
+                size += len(chunk)
+                if size > STAGE_MAX_BYTES:
+                    raise FileTooLargeError(f"{file.filename} exceeds {STAGE_MAX_BYTES} bytes")
+                hasher.update(chunk)
+                buffer.write(chunk)
+        except BaseException:
+            buffer.close()
+            raise
+        buffer.seek(0)
+        return StagedFile(hasher.hexdigest(), size, file.content_type, file=buffer)
+
+    def store_staged(self, staged: StagedFile, key: str) -> str:
+        """Stores a staged file under key unless that key already exists, and returns the key's URL."""
+        if self.stat(key) is None:
+            folder, filename = key.rsplit("/", 1)
+            headers = Headers({"content-type": staged.content_type}) if staged.content_type else None
+            self.save(UploadFile(file=staged.file, filename=filename, headers=headers), filename, folder)
+        return self.url_for(key)
+
+    def stage_many(self, files: List[UploadFile], folder: Optional[str] = None) -> List[StagedFile]:
+        staged, errors = _run_all([lambda file=file: self.stage(file, folder) for file in files])
+        if errors:
+            for staged_file in staged:
+                if staged_file is not None:
+                    staged_file.close()
+            raise errors[0]
+        return staged
+
+    def store_staged_many(self, items: List[Tuple[StagedFile, str]]) -> List[str]:
+        """Stores (staged file, key) pairs concurrently. Stored keys may be shared, so nothing is rolled back on failure."""
+        urls, errors = _run_all([lambda staged=staged, key=key: self.store_staged(staged, key) for staged, key in items])
+        if errors:
+            raise errors[0]
+        return urls
+
+    def delete_batch(self, file_urls: List[str]) -> Dict[str, str]:
+        """Deletes several files and returns {file_url: error} for the ones that could not be deleted.
+
+        A file that is already gone counts as deleted.
+        """
+        errors = {}
+        for file_url in file_urls:
+            try:
+                self.delete(file_url)
+            except Exception as e:
+                errors[file_url] = str(e)
+        return errors
 
+    def delete_many(self, file_urls: List[str]) -> None:
+        """Best-effort deletion of several files."""
+        for file_url, error in self.delete_batch(file_urls).items():
+            print(f"Error deleting {file_url}: {error}")
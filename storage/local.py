@@ -1,26 +1,97 @@
 import os
-import shutil
+import hashlib
+import mimetypes
+import tempfile
+from datetime import datetime, timedelta, timezone
 from fastapi import UploadFile
-from .base import BaseStorage
-from typing import Optional
+from jose import jwt, JWTError
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+from starlette.types import Scope
+from .base import BaseStorage, FileTooLargeError, StagedFile, content_hash_of, cache_control_for
+from typing import Optional, Tuple
 
 # Assume a directory for uploads
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Signs direct upload URLs handed out by presign_upload
+UPLOAD_SIGNING_KEY = os.getenv("UPLOAD_SIGNING_KEY", os.getenv("SECRET_KEY", "super-secret-key"))
+UPLOAD_SIGNING_ALGORITHM = "HS256"
+
+LOCAL_STORAGE_BUFFER_SIZE = int(os.getenv("LOCAL_STORAGE_BUFFER_SIZE", str(1024 * 1024)))
+LOCAL_STORAGE_MAX_BYTES = int(os.getenv("LOCAL_STORAGE_MAX_BYTES", str(20 * 1024 * 1024)))
+# "none": rely on the OS, "file": fsync the file before rename, "full": also fsync the directory after rename
+LOCAL_STORAGE_FSYNC = os.getenv("LOCAL_STORAGE_FSYNC", "file")
+
 class LocalStorage(BaseStorage):
-    def save(self, file: UploadFile, filename: str, folder: Optional[str] = None) -> str:
+    def _write_temp(self, fileobj, target_dir: str, label: str, hasher=None) -> Tuple[str, int]:
+        """Copies fileobj in chunks into a temp file in target_dir. Returns (temp_path, size)."""
+        fd, temp_path = tempfile.mkstemp(dir=target_dir, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                written = 0
+                while chunk := fileobj.read(LOCAL_STORAGE_BUFFER_SIZE):
+                    written += len(chunk)
+                    if written > LOCAL_STORAGE_MAX_BYTES:
+                        raise FileTooLargeError(f"{label} exceeds {LOCAL_STORAGE_MAX_BYTES} bytes")
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    buffer.write(chunk)
+                if LOCAL_STORAGE_FSYNC in ("file", "full"):
+                    buffer.flush()
+                    os.fsync(buffer.fileno())
+            os.chmod(temp_path, 0o644)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return temp_path, written
+
+    def _publish(self, temp_path: str, file_path: str) -> None:
+        os.replace(temp_path, file_path)
+        if LOCAL_STORAGE_FSYNC == "full":
+            dir_fd = os.open(os.path.dirname(file_path), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def _target_dir(self, folder: Optional[str]) -> str:
         target_dir = UPLOAD_DIR
         if folder:
             target_dir = os.path.join(UPLOAD_DIR, folder)
             os.makedirs(target_dir, exist_ok=True) # Create subfolder if it doesn't exist
+        return target_dir
 
+    def save(self, file: UploadFile, filename: str, folder: Optional[str] = None) -> str:
+        target_dir = self._target_dir(folder)
         file_path = os.path.join(target_dir, filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Write to a temp file in the same directory and rename, so a half-written file is never visible.
+        temp_path, _ = self._write_temp(file.file, target_dir, filename)
+        try:
+            self._publish(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
         # In a real app, this URL should be based on the server's domain
         return f"/{file_path}"
 
+    def stage(self, file: UploadFile, folder: Optional[str] = None) -> StagedFile:
+        # Staged next to its final location so store_staged is a rename.
+        hasher = hashlib.sha256()
+        temp_path, size = self._write_temp(file.file, self._target_dir(folder), file.filename, hasher)
+        return StagedFile(hasher.hexdigest(), size, file.content_type, path=temp_path)
+
+    def store_staged(self, staged: StagedFile, key: str) -> str:
+        file_path = os.path.join(UPLOAD_DIR, key)
+        if os.path.exists(file_path):
+            staged.close()
+        else:
+            self._publish(staged.path, file_path)
+        return self.url_for(key)
+
     def delete(self, file_url: str) -> None:
         # file_url will be like /uploads/board/image.png
         # Remove the leading '/'
@@ -29,3 +100,62 @@ class LocalStorage(BaseStorage):
             os.remove(relative_path)
         else:
             print(f"File not found for deletion: {relative_path}") # Or log a warning
+
+    def url_for(self, key: str) -> str:
+        return f"/{UPLOAD_DIR}/{key}"
+
+    def presign_upload(self, key: str, content_type: str, size: int, expires_in: int) -> dict:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+        token = jwt.encode(
+            {"typ": "upload", "key": key, "content_type": content_type, "size": size, "exp": expires_at},
+            UPLOAD_SIGNING_KEY,
+            algorithm=UPLOAD_SIGNING_ALGORITHM,
+        )
+        return {
+            "upload_url": f"/storage/uploads/{token}",
+            "method": "PUT",
+            "headers": {"Content-Type": content_type},
+        }
+
+    def verify_upload_token(self, token: str) -> dict:
+        """Returns the claims of a signed upload URL token. Raises ValueError if it is invalid or expired."""
+        try:
+            claims = jwt.decode(token, UPLOAD_SIGNING_KEY, algorithms=[UPLOAD_SIGNING_ALGORITHM])
+        except JWTError as e:
+            raise ValueError(str(e))
+        if claims.get("typ") != "upload":
+            raise ValueError("Not an upload token")
+        return claims
+
+    def stat(self, key: str) -> Optional[Tuple[int, Optional[str]]]:
+        file_path = os.path.join(UPLOAD_DIR, key)
+        if not os.path.isfile(file_path):
+            return None
+        return os.path.getsize(file_path), mimetypes.guess_type(file_path)[0]
+
+
+class UploadStaticFiles(StaticFiles):
+    """Serves UPLOAD_DIR with cache headers suited to write-once files.
+
+    Content-addressed files get their SHA-256 as a strong ETag (identical on
+    every server, unlike the default mtime/size tag) and immutable
+    Cache-Control. Range requests and If-None-Match are handled by
+    FileResponse/StaticFiles, and servers that support the ASGI pathsend
+    extension transfer the file with sendfile. In-progress temp files
+    (dot-prefixed) are never served.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if any(part.startswith(".") for part in path.split(os.sep)):
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        headers = {"cache-control": cache_control_for(str(full_path))}
+        content_hash = content_hash_of(str(full_path))
+        if content_hash:
+            headers["etag"] = f'"{content_hash}"'
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -1,16 +1,21 @@
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
 
 import os
 import boto3
 from fastapi import UploadFile
-from botocore.exceptions import NoCredentialsError
-from .base import BaseStorage
+from botocore.exceptions import NoCredentialsError, ClientError
+from .base import BaseStorage, cache_control_for
 
 # Get S3 config from environment variables
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION")
+# Optional, for S3-compatible services (MinIO, LocalStack, ...)
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+
+# DeleteObjects accepts at most 1000 keys per request
+S3_DELETE_BATCH_SIZE = 1000
 
 class S3Storage(BaseStorage):
     def __init__(self):
@@ -20,7 +25,8 @@ class S3Storage(BaseStorage):
             "s3",
             aws_access_key_id=AWS_ACCESS_KEY_ID,
             aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
+            region_name=AWS_REGION,
+            endpoint_url=S3_ENDPOINT_URL
         )
         self.bucket_name = S3_BUCKET_NAME
 
@@ -31,20 +37,74 @@ class S3Storage(BaseStorage):
                 file.file,
                 self.bucket_name,
                 s3_key,
-                ExtraArgs={'ContentType': file.content_type}
+                ExtraArgs={'ContentType': file.content_type, 'CacheControl': cache_control_for(filename)}
             )
             # Return the public URL of the file
-            return f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
+            return self.url_for(s3_key)
         except NoCredentialsError:
             raise Exception("AWS credentials not available.")
 
+    def url_for(self, key: str) -> str:
+        if S3_ENDPOINT_URL:
+            return f"{S3_ENDPOINT_URL.rstrip('/')}/{self.bucket_name}/{key}"
+        return f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{key}"
+
+    def _key_from_url(self, file_url: str) -> str:
+        base_url = self.url_for("")
+        if file_url.startswith(base_url):
+            return file_url[len(base_url):]
+        # Assuming file_url is in the format: https://<bucket_name>.s3.<region>.amazonaws.com/<s3_key>
+        return "/".join(file_url.split("/")[3:])
+
+    def presign_upload(self, key: str, content_type: str, size: int, expires_in: int) -> dict:
+        # Content-Type and Content-Length are part of the signature, so S3 rejects any other upload.
+        upload_url = self.s3_client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket_name, "Key": key, "ContentType": content_type, "ContentLength": size},
+            ExpiresIn=expires_in,
+            HttpMethod="PUT",
+        )
+        return {
+            "upload_url": upload_url,
+            "method": "PUT",
+            "headers": {"Content-Type": content_type, "Content-Length": str(size)},
+        }
+
+    def stat(self, key: str) -> Optional[Tuple[int, Optional[str]]]:
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return response["ContentLength"], response.get("ContentType")
+
     def delete(self, file_url: str) -> None:
         try:
-            # Extract the S3 key from the file_url
-            # Assuming file_url is in the format: https://<bucket_name>.s3.<region>.amazonaws.com/<s3_key>
-            s3_key = "/".join(file_url.split("/")[3:])
+            s3_key = self._key_from_url(file_url)
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
         except NoCredentialsError:
             raise Exception("AWS credentials not available.")
         except Exception as e:
             print(f"Error deleting S3 object {file_url}: {e}") # Or log a warning
+
+    def delete_batch(self, file_urls: List[str]) -> Dict[str, str]:
+        """Deletes files with DeleteObjects, up to S3_DELETE_BATCH_SIZE keys per request."""
+        errors = {}
+        for start in range(0, len(file_urls), S3_DELETE_BATCH_SIZE):
+            chunk = file_urls[start:start + S3_DELETE_BATCH_SIZE]
+            urls_by_key = {self._key_from_url(file_url): file_url for file_url in chunk}
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in urls_by_key], "Quiet": True}
+                )
+            except Exception as e:
+                errors.update({file_url: str(e) for file_url in chunk})
+                continue
+            # Quiet mode only reports the keys that failed
+            for error in response.get("Errors", []):
+                file_url = urls_by_key.get(error.get("Key"))
+                if file_url:
+                    errors[file_url] = f"{error.get('Code')}: {error.get('Message')}"
+        return errors
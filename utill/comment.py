@@ -1,11 +1,13 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session, selectinload
 from typing import List
 
 from models.user import User
 from models.community import Comment
-from models.notification import Notification,Mention
+from models.notification import Mention
 from schemas.community import CommentResponse # Assuming CommentResponse is needed for return type
-from utils.fcm import send_push_notification
+from services.notification import create_notifications
+from services.push import PushMessage
 
 
 def process_mentions_and_notifications(
@@ -13,42 +15,54 @@ def process_mentions_and_notifications(
         mentions: list[str],
         new_comment: Comment,
         current_user: User
-):
+) -> List[PushMessage]:
     """
-    Processes mentions in a comment, creates Mention records, and sends notifications.
+    Processes mentions in a comment, creates Mention and Notification records,
+    and returns the push messages to send once the caller has committed.
+
+    Usernames are resolved with a single IN query and the rows are bulk-inserted
+    in the caller's transaction; nothing is committed or sent here. Users that
+    are already mentioned on the comment are skipped, so editing a comment
+    only notifies newly mentioned users.
 
     Args:
         db (Session): The database session.
         mentions (list[str]): A list of usernames mentioned in the comment.
-        new_comment (Comment): The newly created comment object.
+        new_comment (Comment): The comment object (must already be flushed).
         current_user (User): The user who created the comment.
     """
-    if not mentions:
-        return
-
-    for mentioned_username in mentions:
-        mentioned_user = db.query(User).filter(User.username == mentioned_username).first()
-        if not mentioned_user:
-            continue
+    usernames = set(mentions or [])
+    if not usernames:
+        return []
 
-        mention = Mention(comment_id=new_comment.id, user_id=mentioned_user.id)
-        db.add(mention)
+    already_mentioned = db.query(Mention.user_id).filter(Mention.comment_id == new_comment.id)
+    mentioned_users = (
+        db.query(User.id, User.fcm_token)
+        .filter(User.username.in_(usernames), User.id.not_in(already_mentioned))
+        .order_by(User.id)
+        .all()
+    )
+    if not mentioned_users:
+        return []
 
-        notification = Notification(
-            user_id=mentioned_user.id,
-            comment_id=new_comment.id,
-            type="mention",
-            message=f"{current_user.username}님이 회원님을 멘션했습니다."
-        )
-        db.add(notification)
+    db.execute(insert(Mention), [
+        {"comment_id": new_comment.id, "user_id": user_id} for user_id, _ in mentioned_users
+    ])
+    create_notifications(db, [
+        {
+            "user_id": user_id,
+            "comment_id": new_comment.id,
+            "type": "mention",
+            "message": f"{current_user.username}님이 회원님을 멘션했습니다.",
+        }
+        for user_id, _ in mentioned_users
+    ])
 
-        if hasattr(mentioned_user, 'fcm_token') and mentioned_user.fcm_token:
-            send_push_notification(
-                db=db,
-                user=mentioned_user,
-                device_token=mentioned_user.fcm_token,
-                message=f"{current_user.username}님이 댓글에서 회원님을 멘션했습니다."
-            )
+    return [
+        PushMessage(user_id, fcm_token, f"{current_user.username}님이 댓글에서 회원님을 멘션했습니다.")
+        for user_id, fcm_token in mentioned_users
+        if fcm_token
+    ]
 
 def get_replies(db: Session, parent_comment_id: int) -> List[CommentResponse]:
     """
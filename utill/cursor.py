@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque URL-safe token."""
+    return _encode({"c": created_at.isoformat(), "i": item_id})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by encode_cursor, raising 400 when it is malformed."""
+    try:
+        data = _decode(cursor)
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, item_id: int) -> str:
+    """Encode a (rank, id) keyset position for relevance-ordered results."""
+    return _encode({"r": rank, "i": item_id})
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        data = _decode(cursor)
+        return float(data["r"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_distance_cursor(distance_km: float, created_at: datetime, item_id: int) -> str:
+    """Encode a (distance, created_at, id) keyset position for nearest-first results."""
+    return _encode({"d": distance_km, "c": created_at.isoformat(), "i": item_id})
+
+
+def decode_distance_cursor(cursor: str) -> Tuple[float, datetime, int]:
+    try:
+        data = _decode(cursor)
+        return float(data["d"]), datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, created_at_column, id_column, cursor: Optional[str]):
+    """Order a query newest-first by (created_at, id) and, when a cursor is given, continue after it."""
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_at_column, id_column) < tuple_(created_at, item_id))
+    return query.order_by(created_at_column.desc(), id_column.desc())
+
+
+def next_cursor(items: list, page_size: int) -> Optional[str]:
+    """Cursor for the page after `items`, or None when this was the last page."""
+    if len(items) < page_size or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
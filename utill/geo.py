@@ -0,0 +1,141 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+# 목록용 경로 썸네일: 최대 점 개수와 소수점 자리수 (5자리 ≈ 1m)
+THUMBNAIL_MAX_POINTS = 32
+THUMBNAIL_PRECISION = 5
+THUMBNAIL_INPUT_MAX_POINTS = 2000
+
+
+def _lat_lon(point: Optional[Dict[str, Any]]) -> Tuple[Optional[float], Optional[float]]:
+    """Extract (lat, lon) from a stored route point, or (None, None) when it is missing."""
+    if not point or point.get('lat') is None or point.get('lon') is None:
+        return None, None
+    return float(point['lat']), float(point['lon'])
+
+
+def _segment_distance(point: Tuple[float, float], start: Tuple[float, float], end: Tuple[float, float]) -> float:
+    """Planar distance from point to the segment start-end, in degrees (fine for thumbnails)."""
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return math.hypot(x - x1, y - y1)
+    t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(x - (x1 + t * dx), y - (y1 + t * dy))
+
+
+def _douglas_peucker(coords: List[Tuple[float, float]], tolerance: float) -> List[int]:
+    """Indices of the points kept by Ramer-Douglas-Peucker, iteratively so long routes cannot hit the recursion limit."""
+    keep = {0, len(coords) - 1}
+    stack = [(0, len(coords) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _segment_distance(coords[i], coords[first], coords[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep.add(index)
+            stack.append((first, index))
+            stack.append((index, last))
+    return sorted(keep)
+
+
+def simplify_polyline(
+    points_json: Optional[List[Dict[str, Any]]], max_points: int = THUMBNAIL_MAX_POINTS
+) -> Optional[List[List[float]]]:
+    """Simplify route points to at most max_points [lat, lon] pairs for list thumbnails.
+
+    The Douglas-Peucker tolerance starts at 0.5% of the route's bounding-box
+    diagonal and doubles until the result fits.
+    """
+    coords = []
+    for point in points_json or []:
+        lat, lon = _lat_lon(point)
+        if lat is not None:
+            coords.append((lat, lon))
+    if not coords:
+        return None
+
+    if len(coords) > THUMBNAIL_INPUT_MAX_POINTS:
+        # 썸네일 해상도에는 영향이 없으니 긴 경로는 먼저 균등하게 솎아낸다 (끝점은 유지)
+        step = len(coords) / (THUMBNAIL_INPUT_MAX_POINTS - 1)
+        coords = [coords[int(i * step)] for i in range(THUMBNAIL_INPUT_MAX_POINTS - 1)] + [coords[-1]]
+
+    if len(coords) > max_points:
+        lats, lons = [lat for lat, _ in coords], [lon for _, lon in coords]
+        tolerance = max(math.hypot(max(lats) - min(lats), max(lons) - min(lons)) * 0.005, 1e-7)
+        kept = _douglas_peucker(coords, tolerance)
+        while len(kept) > max_points:
+            tolerance *= 2
+            coarser = [kept[i] for i in _douglas_peucker([coords[i] for i in kept], tolerance)]
+            if len(coarser) < max_points // 2:
+                # Too wiggly to simplify gracefully: sample the last result evenly instead.
+                step = (len(kept) - 1) / (max_points - 1)
+                coarser = [kept[round(i * step)] for i in range(max_points)]
+            kept = coarser
+        coords = [coords[i] for i in kept]
+
+    return [[round(lat, THUMBNAIL_PRECISION), round(lon, THUMBNAIL_PRECISION)] for lat, lon in coords]
+
+
+def route_spatial_fields(
+    start_point: Optional[Dict[str, Any]],
+    end_point: Optional[Dict[str, Any]],
+    points_json: Optional[List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Compute the indexed spatial columns and the list thumbnail of a Route from its JSONB points."""
+    start_lat, start_lon = _lat_lon(start_point)
+    end_lat, end_lon = _lat_lon(end_point)
+
+    lats, lons = [], []
+    for point in points_json or []:
+        lat, lon = _lat_lon(point)
+        if lat is not None:
+            lats.append(lat)
+            lons.append(lon)
+
+    return {
+        "start_lat": start_lat,
+        "start_lon": start_lon,
+        "end_lat": end_lat,
+        "end_lon": end_lon,
+        "min_lat": min(lats) if lats else None,
+        "min_lon": min(lons) if lons else None,
+        "max_lat": max(lats) if lats else None,
+        "max_lon": max(lons) if lons else None,
+        "thumbnail_polyline": simplify_polyline(points_json),
+    }
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """Return (min_lat, min_lon, max_lat, max_lon) enclosing a circle around (lat, lon)."""
+    delta_lat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6:
+        delta_lon = 180.0
+    else:
+        delta_lon = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    return (
+        max(lat - delta_lat, -90.0),
+        max(lon - delta_lon, -180.0),
+        min(lat + delta_lat, 90.0),
+        min(lon + delta_lon, 180.0),
+    )
+
+
+def sql_haversine_km(lat_column, lon_column, lat: float, lon: float):
+    """SQL expression for the great-circle distance in km between a column pair and a point."""
+    a = (
+        func.power(func.sin(func.radians(lat_column - lat) / 2), 2)
+        + math.cos(math.radians(lat))
+        * func.cos(func.radians(lat_column))
+        * func.power(func.sin(func.radians(lon_column - lon) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
@@ -0,0 +1,41 @@
+import hashlib
+import math
+from typing import Hashable, Optional
+
+DEFAULT_PRECISION = 10  # 2^10 registers = 1 KiB per sketch, ~3% standard error
+
+
+class HyperLogLog:
+    """Compact cardinality sketch used for unique-viewer estimates."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        if registers is not None and len(registers) == self.m:
+            self.registers = bytearray(registers)
+        else:
+            self.registers = bytearray(self.m)
+
+    def add(self, item: Hashable) -> None:
+        h = int.from_bytes(hashlib.blake2b(str(item).encode(), digest_size=8).digest(), "big")
+        index = h >> (64 - self.precision)
+        remaining = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        for i, value in enumerate(other.registers):
+            if value > self.registers[i]:
+                self.registers[i] = value
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
@@ -0,0 +1,46 @@
+"""
+Korean-friendly tokenization for post search.
+
+PostgreSQL's text search configurations split Korean only on whitespace, so a
+search for "한강" would never match "한강에서". Runs of Hangul syllables are
+therefore indexed as overlapping syllable bigrams ("한강에서" -> 한강 강에 에서),
+and other words as lowercase tokens. A query is turned into the same bigrams,
+joined with the phrase operator (<->) so they must appear next to each other.
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+_WORD = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+_HANGUL = re.compile(r"^[가-힣]+$")
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def _bigrams(run: str) -> List[str]:
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def search_tokens(text: str) -> str:
+    """Space-separated tokens to store with to_tsvector('simple', ...)."""
+    tokens = []
+    for word in _WORD.findall(_normalize(text)):
+        tokens.extend(_bigrams(word) if _HANGUL.match(word) else [word])
+    return " ".join(tokens)
+
+
+def search_query(text: str) -> Optional[str]:
+    """to_tsquery('simple', ...) text for a user query, or None if it has nothing searchable."""
+    parts = []
+    for word in _WORD.findall(_normalize(text)):
+        if _HANGUL.match(word) and len(word) == 1:
+            parts.append(f"{word}:*")  # 한 글자 검색은 해당 글자로 시작하는 바이그램과 매칭
+        elif _HANGUL.match(word):
+            parts.append("(" + " <-> ".join(_bigrams(word)) + ")")
+        else:
+            parts.append(word)
+    return " & ".join(parts) if parts else None
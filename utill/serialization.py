@@ -0,0 +1,41 @@
+"""
+JSON responses for list endpoints, serialized by pydantic-core without validation.
+
+Services build plain dicts straight from SQL result tuples, and a cached
+TypeAdapter for a TypedDict schema serializes them. Serializing a TypedDict from
+a dict neither constructs nor validates models. Returning a Response also makes
+FastAPI skip its response_model validation, so response_model only documents the
+schema.
+"""
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional
+
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+@lru_cache(maxsize=None)
+def list_adapter(item_type: Any) -> TypeAdapter:
+    """TypeAdapter for List[item_type]. Building one compiles a core schema, so each type gets exactly one."""
+    return TypeAdapter(List[item_type])
+
+
+class AdapterJSONResponse(Response):
+    """JSON response rendered by TypeAdapter.dump_json, e.g. AdapterJSONResponse(items, list_adapter(PostListItem))."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        adapter: TypeAdapter,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        self.adapter = adapter
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
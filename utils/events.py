@@ -1,19 +1,75 @@
-
-from sqlalchemy import event
+from sqlalchemy import event, func, inspect, update
+from sqlalchemy.orm import Session, object_session
 from models.image import Image
 from models.community import Post
-from dependencies import get_storage_manager_instance
+from models.route import Route
+from models.notification import Notification
+from models.user import User
+from services.storage_cleanup import storage_cleanup_worker, release_storage_urls, PENDING_FLAG
+from services.notification_stream import publish_unread_counts
+from utill.geo import route_spatial_fields
+from utill.search import search_tokens
+
+
+def _enqueue_cleanup(connection, target, url):
+    # Written on the flush connection, so the queue row commits or rolls back with the delete.
+    if release_storage_urls(connection, [url]):
+        session = object_session(target)
+        if session is not None:
+            session.info[PENDING_FLAG] = True
 
 @event.listens_for(Image, 'before_delete')
 def before_delete_image_listener(mapper, connection, target):
-    """Listen for the 'before_delete' event on Image objects and delete the corresponding file from storage."""
-    storage_manager = get_storage_manager_instance()
+    """Listen for the 'before_delete' event on Image objects and schedule the file for deletion from storage."""
     if target.url:
-        storage_manager.delete(target.url)
+        _enqueue_cleanup(connection, target, target.url)
 
 @event.listens_for(Post, 'before_delete')
 def before_delete_post_listener(mapper, connection, target):
-    """Listen for the 'before_delete' event on Post objects and delete the map_image_url from storage."""
-    storage_manager = get_storage_manager_instance()
+    """Listen for the 'before_delete' event on Post objects and schedule the map_image_url for deletion from storage."""
     if target.map_image_url:
-        storage_manager.delete(target.map_image_url)
+        _enqueue_cleanup(connection, target, target.map_image_url)
+
+@event.listens_for(Notification, 'before_delete')
+def before_delete_notification_listener(mapper, connection, target):
+    """Listen for the 'before_delete' event on Notification objects (e.g. cascaded from a comment) and keep the recipient's unread count in step."""
+    if not target.is_read:
+        counts = connection.execute(
+            update(User)
+            .where(User.id == target.user_id)
+            .values(unread_notification_count=func.greatest(User.unread_notification_count - 1, 0))
+            .returning(User.id, User.unread_notification_count)
+        ).all()
+        publish_unread_counts(connection, counts)
+
+
+@event.listens_for(Session, 'after_commit')
+def after_commit_storage_cleanup_listener(session):
+    """Wake the cleanup worker once queued deletions are committed."""
+    if session.info.pop(PENDING_FLAG, False):
+        storage_cleanup_worker.trigger()
+
+@event.listens_for(Session, 'after_rollback')
+def after_rollback_storage_cleanup_listener(session):
+    session.info.pop(PENDING_FLAG, None)
+
+@event.listens_for(Route, 'before_insert')
+@event.listens_for(Route, 'before_update')
+def before_save_route_listener(mapper, connection, target):
+    """Keep the indexed spatial columns of a Route in sync with its JSONB points."""
+    for key, value in route_spatial_fields(target.start_point, target.end_point, target.points_json).items():
+        setattr(target, key, value)
+
+def post_search_vector(title, content):
+    return func.setweight(func.to_tsvector("simple", search_tokens(title)), "A").op("||")(
+        func.setweight(func.to_tsvector("simple", search_tokens(content)), "B")
+    )
+
+@event.listens_for(Post, 'before_insert')
+@event.listens_for(Post, 'before_update')
+def before_save_post_listener(mapper, connection, target):
+    """Keep the search_vector of a Post in sync with its title and content."""
+    state = inspect(target)
+    if state.has_identity and not (state.attrs.title.history.has_changes() or state.attrs.content.history.has_changes()):
+        return
+    target.search_vector = post_search_vector(target.title, target.content)
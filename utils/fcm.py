@@ -1,34 +1,86 @@
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional
+
 import firebase_admin
-from firebase_admin import credentials, messaging
-from sqlalchemy.orm import Session
-
-from models.user import User
-
-# Initialize Firebase Admin SDK (only once)
-# Replace 'path/to/your/serviceAccountKey.json' with the actual path to your Firebase service account key file.
-# It's recommended to store this path in an environment variable.
-try:
-    cred = credentials.Certificate('key/pedal-1e999-firebase-adminsdk-fbsvc-0dba55d5dc.json')
-    firebase_admin.initialize_app(cred)
-except ValueError:
-    # App is already initialized, which can happen in development with hot-reloading
-    pass
-
-def send_push_notification(db: Session, user: User, device_token: str, message: str):
-    try:
-        message_obj = messaging.Message(
-            notification=messaging.Notification(
-                title='새로운 멘션 알림',
-                body=message,
-            ),
-            token=device_token,
-        )
-        response = messaging.send(message_obj)
-        print('Successfully sent message:', response)
-    except messaging.UnregisteredError:
-        print(f"FCM token for user {user.id} is unregistered. Clearing token.")
-        user.fcm_token = None
-        db.add(user)
-        db.commit()
-    except Exception as e:
-        print(f"Error sending message: {e}")
+from firebase_admin import credentials, exceptions, messaging
+
+# FCM accepts at most 500 messages per send_each call.
+FCM_BATCH_SIZE = 500
+FCM_CREDENTIALS_PATH = os.getenv(
+    "FCM_CREDENTIALS_PATH", "key/pedal-1e999-firebase-adminsdk-fbsvc-0dba55d5dc.json"
+)
+
+# The device token is no longer valid; FCM also reports malformed tokens as INVALID_ARGUMENT.
+INVALID_TOKEN_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError, exceptions.InvalidArgumentError)
+# Worth sending again later (throttling, FCM outages).
+RETRYABLE_ERRORS = (
+    exceptions.ResourceExhaustedError, exceptions.UnavailableError,
+    exceptions.InternalError, exceptions.DeadlineExceededError,
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """FCM errors listed in RETRYABLE_ERRORS, or anything that is not an FCM error (e.g. a network failure)."""
+    return isinstance(error, RETRYABLE_ERRORS) or not isinstance(error, exceptions.FirebaseError)
+
+
+def build_message(token: str, title: str, body: str) -> messaging.Message:
+    return messaging.Message(
+        notification=messaging.Notification(title=title, body=body),
+        token=token,
+    )
+
+
+class MessagingBackend(ABC):
+    @abstractmethod
+    def send_each(self, messages: List[messaging.Message]) -> List[Optional[Exception]]:
+        """Sends up to FCM_BATCH_SIZE messages and returns one error (or None on success) per message, in order.
+
+        Raises if the whole batch could not be sent.
+        """
+        pass
+
+
+class FCMBackend(MessagingBackend):
+    def __init__(self):
+        # Initialize Firebase Admin SDK (only once)
+        try:
+            firebase_admin.initialize_app(credentials.Certificate(FCM_CREDENTIALS_PATH))
+        except ValueError:
+            # App is already initialized, which can happen in development with hot-reloading
+            pass
+
+    def send_each(self, messages: List[messaging.Message]) -> List[Optional[Exception]]:
+        response = messaging.send_each(messages)
+        return [result.exception for result in response.responses]
+
+
+class FakeMessagingBackend(MessagingBackend):
+    """Records messages instead of sending them, for local development and tests.
+
+    errors maps a device token to the exception to report for it; tokens not in it succeed.
+    """
+
+    def __init__(self, errors: Optional[Dict[str, Exception]] = None):
+        self.errors = errors if errors is not None else {}
+        self.batches: List[List[messaging.Message]] = []
+        self.sent: List[messaging.Message] = []
+
+    def send_each(self, messages: List[messaging.Message]) -> List[Optional[Exception]]:
+        self.batches.append(list(messages))
+        results = [self.errors.get(message.token) for message in messages]
+        self.sent.extend(message for message, error in zip(messages, results) if error is None)
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_messaging_backend() -> MessagingBackend:
+    backend_type = os.getenv("PUSH_BACKEND", "fcm")
+    if backend_type == "fcm":
+        return FCMBackend()
+    elif backend_type == "fake":
+        return FakeMessagingBackend()
+    else:
+        raise ValueError(f"Unknown push backend: {backend_type}")